@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Optional
 import sys
 import os
 
@@ -24,14 +25,41 @@ def get_high_scores_path() -> Path:
 	return get_data_dir() / "highscores.json"
 
 
+def get_scores_db_path() -> Path:
+	return get_data_dir() / "scores.db"
+
+
+def get_profiles_path() -> Path:
+	return get_data_dir() / "profiles.json"
+
+
+def get_sync_state_path() -> Path:
+	return get_data_dir() / "sync_state.json"
+
+
+def get_mastery_path() -> Path:
+	return get_data_dir() / "mastery.json"
+
+
+def get_analytics_path() -> Path:
+	return get_data_dir() / "analytics.json"
+
+
+_assets_dir: Optional[Path] = None
+
+
 def get_assets_dir() -> Path:
 	"""Get assets directory - for frozen apps, use bundled resources"""
-	if getattr(sys, 'frozen', False):
+	global _assets_dir
+	if _assets_dir is not None:
+		return _assets_dir
+	if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
 		# Running as EXE - use the bundled assets
 		# PyInstaller extracts to sys._MEIPASS
-		if hasattr(sys, '_MEIPASS'):
-			return Path(sys._MEIPASS) / "assets"
-	# Running in development or fallback
+		_assets_dir = Path(sys._MEIPASS) / "assets"
+		return _assets_dir
+	# Running in development or fallback; it's looked up constantly, so only create it once
 	assets = get_project_root() / "assets"
 	(assets / "images").mkdir(parents=True, exist_ok=True)
+	_assets_dir = assets
 	return assets
@@ -1,26 +1,88 @@
-from typing import Dict, Type
+from collections import OrderedDict, deque
+from importlib import import_module
+from typing import Callable, Deque, Dict, Iterable, Optional
+import time
+from kivy.clock import Clock
 from kivy.uix.screenmanager import ScreenManager, Screen
 
 
+ScreenFactory = Callable[..., Screen]
+
+# Live screens kept by default; each screen counts as its `cache_weight` (1 if unset),
+# so heavy screens (video, big images) can claim more of the budget
+DEFAULT_SCREEN_BUDGET = 6
+# Prewarm work done per idle frame; one step (an import or a screen build) always runs
+PREWARM_SLICE = 0.008
+PREWARM_DELAY = 0.5
+
+
+class LazyScreen:
+	"""Screen factory that imports its module on first use.
+
+	`load()` does only the import, so the Navigator can prewarm the import and the
+	widget build in separate frames.
+	"""
+
+	def __init__(self, module: str, attr: str, package: Optional[str] = None) -> None:
+		self.module = module
+		self.attr = attr
+		self.package = package
+		self._cls: Optional[ScreenFactory] = None
+
+	@property
+	def loaded(self) -> bool:
+		return self._cls is not None
+
+	def load(self) -> ScreenFactory:
+		if self._cls is None:
+			self._cls = getattr(import_module(self.module, self.package), self.attr)
+		return self._cls
+
+	def __call__(self, **kwargs) -> Screen:
+		return self.load()(**kwargs)
+
+
 class Navigator:
-	"""Simple navigator backed by a Kivy ScreenManager."""
+	"""Navigator backed by a Kivy ScreenManager that owns screen lifetimes.
 
-	def __init__(self, screen_manager: ScreenManager) -> None:
+	Screens are built from their registered factory on first show and kept in an LRU.
+	When the live screens weigh more than `budget`, the least recently shown ones are
+	removed; a screen that defines `on_evict()` gets to release textures, video and
+	subscriptions first. An evicted screen is simply rebuilt the next time it's shown.
+	The current screen, the one just left (it may still be transitioning out) and
+	`pinned` screens are never evicted.
+	"""
+
+	def __init__(self, screen_manager: ScreenManager, budget: int = DEFAULT_SCREEN_BUDGET, pinned: Iterable[str] = ("home",)) -> None:
 		self.screen_manager = screen_manager
-		self._screens: Dict[str, Screen] = {}
-		self._registry: Dict[str, Type[Screen]] = {}
+		self.budget = budget
+		self.pinned = set(pinned)
+		self._screens: "OrderedDict[str, Screen]" = OrderedDict()
+		self._registry: Dict[str, ScreenFactory] = {}
+		self._prewarm: Deque[str] = deque()
+		self._prewarm_event = None
 
-	def register_screen(self, name: str, screen_cls: Type[Screen]) -> None:
+	def register_screen(self, name: str, screen_cls: ScreenFactory) -> None:
 		self._registry[name] = screen_cls
 
+	def is_live(self, name: str) -> bool:
+		return name in self._screens
+
+	def _build(self, name: str) -> Screen:
+		if name not in self._registry:
+			raise KeyError(f"Screen '{name}' is not registered")
+		instance = self._registry[name](name=name, navigator=self)
+		self._screens[name] = instance
+		self.screen_manager.add_widget(instance)
+		return instance
+
 	def show(self, name: str) -> None:
 		if name not in self._screens:
-			if name not in self._registry:
-				raise KeyError(f"Screen '{name}' is not registered")
-			instance = self._registry[name](name=name, navigator=self)
-			self._screens[name] = instance
-			self.screen_manager.add_widget(instance)
+			self._build(name)
+		previous = self.screen_manager.current
+		self._screens.move_to_end(name)
 		self.screen_manager.current = name
+		self._trim(keep={name, previous})
 
 	def show_with_context(self, name: str, **context) -> None:
 		self.show(name)
@@ -29,4 +91,91 @@ class Navigator:
 			try:
 				getattr(screen, "apply_context")(**context)  # type: ignore[misc]
 			except Exception:
-				pass
\ No newline at end of file
+				pass
+
+	def replace(self, name: str, screen_cls: Optional[ScreenFactory] = None) -> None:
+		"""Show a fresh instance of `name` (optionally from a new factory), dropping the old one."""
+		if screen_cls is not None:
+			self.register_screen(name, screen_cls)
+		if name in self._screens:
+			if self.screen_manager.current == name:
+				raise RuntimeError(f"Can't replace '{name}' while it is showing")
+			self.evict(name)
+		self.show(name)
+
+	def reset(self, name: str = "home") -> None:
+		"""Show `name` and drop every other screen that isn't pinned (e.g. between kiosk sessions)."""
+		self.show(name)
+		for other in list(self._screens):
+			if other != name and other not in self.pinned and other != self._leaving():
+				self.evict(other)
+
+	def evict(self, name: str) -> None:
+		"""Remove a live screen; it is rebuilt from its factory the next time it's shown."""
+		screen = self._screens.pop(name, None)
+		if screen is None:
+			return
+		release = getattr(screen, "on_evict", None)
+		if release is not None:
+			try:
+				release()
+			except Exception:
+				pass
+		self.screen_manager.remove_widget(screen)
+
+	def prefetch(self, name: str) -> None:
+		"""Build `name` during idle frames so showing it later costs only the switch."""
+		if name not in self._prewarm and name not in self._screens:
+			self._prewarm.append(name)
+		if self._prewarm_event is None:
+			self._prewarm_event = Clock.schedule_once(self._prewarm_step, 0)
+
+	def prewarm(self, names: Iterable[str], delay: float = PREWARM_DELAY) -> None:
+		"""Prefetch likely next screens, starting `delay` seconds after startup."""
+		for name in names:
+			if name not in self._prewarm and name not in self._screens:
+				self._prewarm.append(name)
+		if self._prewarm_event is None and self._prewarm:
+			self._prewarm_event = Clock.schedule_once(self._prewarm_step, delay)
+
+	def _prewarm_step(self, _dt) -> None:
+		self._prewarm_event = None
+		if self.screen_manager.transition.is_active:
+			# Never compete with an animation; try again next frame
+			self._prewarm_event = Clock.schedule_once(self._prewarm_step, 0)
+			return
+		deadline = time.perf_counter() + PREWARM_SLICE
+		while self._prewarm and time.perf_counter() < deadline:
+			name = self._prewarm[0]
+			factory = self._registry.get(name)
+			if factory is None or name in self._screens:
+				self._prewarm.popleft()
+				continue
+			if isinstance(factory, LazyScreen):
+				if not factory.loaded:
+					factory.load()
+					break  # the import gets this frame; the build waits for the next
+				factory = factory.load()
+			self._prewarm.popleft()
+			if self._weight() + getattr(factory, "cache_weight", 1) <= self.budget:
+				self._build(name)
+				# Speculative: first in line for eviction until it is actually shown
+				self._screens.move_to_end(name, last=False)
+		if self._prewarm:
+			self._prewarm_event = Clock.schedule_once(self._prewarm_step, 0)
+
+	def _leaving(self) -> Optional[str]:
+		transition = self.screen_manager.transition
+		screen_out = getattr(transition, "screen_out", None) if transition.is_active else None
+		return screen_out.name if screen_out is not None else None
+
+	def _weight(self) -> int:
+		return sum(getattr(screen, "cache_weight", 1) for screen in self._screens.values())
+
+	def _trim(self, keep: Iterable[Optional[str]]) -> None:
+		protected = self.pinned.union(n for n in keep if n)
+		for name in list(self._screens):  # least recently shown first
+			if self._weight() <= self.budget:
+				return
+			if name not in protected:
+				self.evict(name)
@@ -0,0 +1,68 @@
+"""
+Cold-start timing. Set LEARNBRIGHT_PROFILE_STARTUP=1 to print where the time before
+the first frame goes, or =exit to also quit right after the first frame (for
+benchmarks/startup.py). Times are measured from when app.main starts executing.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+import os
+import sys
+import time
+
+_STARTED = time.perf_counter()
+
+PROFILE_ENV = "LEARNBRIGHT_PROFILE_STARTUP"
+BUDGET_ENV = "LEARNBRIGHT_STARTUP_BUDGET_MS"
+# Time-to-first-frame we hold ourselves to; benchmarks/startup.py fails above it.
+# Measured baseline: median 270 ms over 18 cold starts (Kivy 2.3.1, offscreen SDL,
+# llvmpipe, 1 CPU); the budget is 1.5x that, so a regression trips it but run-to-run
+# noise (max seen 346 ms) doesn't. Re-measure and move both when startup changes;
+# slower machines set LEARNBRIGHT_STARTUP_BUDGET_MS relative to their own baseline.
+BASELINE_MS = 270.0
+DEFAULT_BUDGET_MS = 1.5 * BASELINE_MS
+
+MODE = os.environ.get(PROFILE_ENV, "").lower()
+ENABLED = MODE not in ("", "0")
+
+_phases: List[Tuple[str, float]] = []
+over_budget = False
+
+
+@contextmanager
+def phase(label: str) -> Iterator[None]:
+	"""Time a block of startup work (imports, building a screen, ...)."""
+	start = time.perf_counter()
+	try:
+		yield
+	finally:
+		if ENABLED:
+			_phases.append((label, time.perf_counter() - start))
+
+
+def budget_ms() -> float:
+	try:
+		return float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MS))
+	except ValueError:
+		return DEFAULT_BUDGET_MS
+
+
+def watch_first_frame(app) -> None:
+	"""Report once the window has presented its first frame (no-op unless profiling)."""
+	if not ENABLED:
+		return
+	from kivy.core.window import Window
+
+	def on_flip(*_args):
+		global over_budget
+		Window.unbind(on_flip=on_flip)
+		first_frame_ms = (time.perf_counter() - _STARTED) * 1000
+		over_budget = first_frame_ms > budget_ms()
+		for label, seconds in _phases:
+			print(f"[startup] {label:<24} {seconds * 1000:8.1f} ms", file=sys.stderr)
+		status = "OVER BUDGET" if over_budget else "ok"
+		print(f"[startup] time to first frame: {first_frame_ms:.1f} ms (budget {budget_ms():.0f} ms, {status})", file=sys.stderr)
+		if MODE == "exit":
+			app.stop()
+
+	Window.bind(on_flip=on_flip)
@@ -1,17 +1,24 @@
-from kivy.app import App
-from kivy.uix.screenmanager import ScreenManager
-from kivy.core.window import Window
-
 try:
-	from .core.navigation import Navigator
-	from .screens.home import HomeScreen
+	from .core import startup
 except ImportError:
 	# Allow running this file directly: python app/main.py
 	import sys
 	from pathlib import Path
 	sys.path.append(str(Path(__file__).resolve().parents[1]))
-	from app.core.navigation import Navigator
+	from app.core import startup
+
+# Only what the home screen needs is imported before the first frame; every other
+# screen is imported lazily by the Navigator (or prewarmed once the app is idle).
+with startup.phase("import kivy + window"):
+	from kivy.app import App
+	from kivy.clock import Clock
+	from kivy.uix.screenmanager import ScreenManager
+	from kivy.core.window import Window
+
+with startup.phase("import home screen"):
+	from app.core.navigation import LazyScreen, Navigator
 	from app.screens.home import HomeScreen
+	from app.services.write_behind import flush_pending_writes
 
 
 class LearnBrightApp(App):
@@ -22,12 +29,40 @@ class LearnBrightApp(App):
 		sm = ScreenManager()
 		self.navigator = Navigator(sm)
 		self.navigator.register_screen("home", HomeScreen)
-		self.navigator.show("home")
+		# Imported on first use (or prewarmed while the home screen sits idle)
+		self.navigator.register_screen("learn", LazyScreen("app.screens.learn", "LearnScreen"))
+		self.navigator.register_screen("lesson", LazyScreen("app.screens.lesson", "LessonScreen"))
+		self.navigator.register_screen("quiz", LazyScreen("app.screens.quiz", "QuizScreen"))
+		self.navigator.register_screen("scores", LazyScreen("app.screens.high_scores", "HighScoresScreen"))
+		with startup.phase("build home screen"):
+			self.navigator.show("home")
+		startup.watch_first_frame(self)
+		# Background sync pulls in the score store; it can wait until after the first frame
+		Clock.schedule_once(lambda _dt: self._start_sync(), 1)
 		return sm
 
+	def _start_sync(self):
+		from app.services.sync import start_sync_from_env
+		start_sync_from_env()
+
+	def on_pause(self):
+		# Android may kill a paused app without calling on_stop
+		flush_pending_writes()
+		return True
+
+	def on_resume(self):
+		# Connectivity often comes back with the app; don't wait for the next poll
+		from app.services.sync import notify_sync
+		notify_sync()
+
+	def on_stop(self):
+		flush_pending_writes()
+
 
 def main() -> None:
 	LearnBrightApp().run()
+	if startup.over_budget and startup.MODE == "exit":
+		raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -5,3 +5,5 @@ from dataclasses import dataclass
 class HighScore:
 	name: str
 	score: int
+	total: int = 0
+	timestamp: str = ""
@@ -0,0 +1,75 @@
+"""
+Bulk export/import of attempt history, for pulling results off many devices.
+
+Run from the project root:
+    python -m app.results export -o tablet07.csv [--mode addition] [--profile ana]
+    python -m app.results import tablet01.jsonl tablet02.csv ...
+    python -m app.results merge -o class.jsonl.gz tablet*.csv
+
+Files are .csv or .jsonl, optionally .gz. Everything streams, so memory stays flat
+however many rows a file has. Attempts are identified by id: importing or merging
+the same attempt twice keeps one copy.
+"""
+from __future__ import annotations
+from typing import Iterator, List, Optional, Sequence
+from itertools import chain
+from pathlib import Path
+import argparse
+import sys
+import time
+from .services.high_score_service import get_high_score_service
+from .services.transfer import FORMATS, dedupe, read_file, write_csv, write_file, write_jsonl
+
+
+def _export(args: argparse.Namespace) -> int:
+	service = get_high_score_service()
+	records = service.iter_attempts()
+	if args.mode:
+		records = (r for r in records if r.get("mode") == args.mode)
+	if args.profile:
+		records = (r for r in records if r.get("profile") == args.profile)
+	if args.output == "-":
+		writer = write_csv if args.format == "csv" else write_jsonl
+		return writer(records, sys.stdout)
+	return write_file(records, Path(args.output))
+
+
+def _read_all(paths: List[str]) -> Iterator[dict]:
+	return chain.from_iterable(read_file(Path(p)) for p in paths)
+
+
+def _import(args: argparse.Namespace) -> int:
+	service = get_high_score_service()
+	added = service.import_attempts(_read_all(args.inputs))
+	service.flush()
+	return added
+
+
+def _merge(args: argparse.Namespace) -> int:
+	return write_file(dedupe(_read_all(args.inputs)), Path(args.output))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+	parser = argparse.ArgumentParser(prog="python -m app.results", description="Export, import and merge quiz attempt history.")
+	sub = parser.add_subparsers(dest="command", required=True)
+	export = sub.add_parser("export", help="write this device's attempts to a file")
+	export.add_argument("-o", "--output", default="-", help="output file (.csv/.jsonl[.gz]), or - for stdout")
+	export.add_argument("--format", choices=FORMATS, default="jsonl", help="format when writing to stdout")
+	export.add_argument("--mode")
+	export.add_argument("--profile")
+	importer = sub.add_parser("import", help="add exported attempts to this device's score store")
+	importer.add_argument("inputs", nargs="+")
+	merge = sub.add_parser("merge", help="combine exports into one file without duplicates")
+	merge.add_argument("-o", "--output", required=True)
+	merge.add_argument("inputs", nargs="+")
+	args = parser.parse_args(argv)
+
+	start = time.perf_counter()
+	count = {"export": _export, "import": _import, "merge": _merge}[args.command](args)
+	elapsed = time.perf_counter() - start
+	verb = {"export": "Exported", "import": "Imported", "merge": "Merged"}[args.command]
+	print(f"{verb} {count} attempts in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+	main()
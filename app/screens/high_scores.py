@@ -1,3 +1,4 @@
+from typing import List
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
@@ -5,7 +6,10 @@ from kivy.uix.image import Image
 from kivy.uix.widget import Widget
 from ..ui import theme
 from ..ui.widgets.buttons import IconRoundButton, BackCircleButton
-from ..services.high_score_service import HighScoreService
+from ..services.analytics import get_fact_analytics
+from ..services.fact_index import DRILL_MODES, mode_title
+from ..services.high_score_service import get_high_score_service
+from ..services.profiles import get_active_profile
 from ..utils.assets import resolve_image_path
 
 
@@ -13,19 +17,32 @@ class HighScoresScreen(Screen):
     def __init__(self, name: str, navigator, **kwargs):
         super().__init__(name=name, **kwargs)
         self.navigator = navigator
-        self.service = HighScoreService()
+        self.service = get_high_score_service()
         self.root_layout = None
+        self.view = "mine"  # or "class" for the class top 10
+        self._mode_buttons = {}
+        self._labels_profile = None
+        self._stale = True
         self._build_ui()
+        self.service.subscribe(self._on_scores_changed)
 
     def on_pre_enter(self):
-        """Refresh the UI every time the screen is shown"""
-        self._build_ui()
+        """Only label text changes on enter; widgets and textures are built once"""
+        self.service.refresh()  # stat-only unless another instance wrote; notifies if so
+        if self._stale or self._labels_profile != get_active_profile():
+            self._update_labels()
+
+    def on_evict(self) -> None:
+        """Called by the Navigator before this screen is dropped"""
+        self.service.unsubscribe(self._on_scores_changed)
+
+    def _on_scores_changed(self) -> None:
+        self._stale = True
+        if self.manager is not None and self.manager.current == self.name:
+            self._update_labels()
 
     def _build_ui(self):
-        """Build or rebuild the UI with fresh data"""
-        # Clear existing widgets
-        self.clear_widgets()
-        
+        """Build the widget tree; scores are filled in by _update_labels"""
         root = BoxLayout(orientation="vertical", padding=[16, 16, 16, 16], spacing=12)
 
         # Header row: back + small logo
@@ -50,8 +67,12 @@ class HighScoresScreen(Screen):
         else:
             root.add_widget(Label(text="[color=10B6DF][b]High Score History[/b][/color]", markup=True, font_size=22))
 
-        # Mode buttons with best score summary - refresh data each time
-        overview = self.service.get_overview()
+        # Switch between the learner's own bests and the class leaderboard
+        self._toggle_btn = IconRoundButton(text="", bg_color=self._hex_to_rgba("#10B6DF"), hover_color=self._hex_to_rgba("#3DD0F2"), on_release=lambda _i: self._toggle_view())
+        root.add_widget(self._toggle_btn)
+        root.add_widget(IconRoundButton(text="Most Missed Facts", bg_color=self._hex_to_rgba("#F25549"), hover_color=self._hex_to_rgba("#FF6A5E"), on_release=lambda _i: self._show_most_missed()))
+
+        # Mode buttons with best score summary
         mode_config = {
             "addition": {"icon": "addition.png", "bg": "#76C043", "hover": "#7FD04A"},
             "subtraction": {"icon": "minus.png", "bg": "#8E66E3", "hover": "#9A74EE"},
@@ -60,35 +81,108 @@ class HighScoresScreen(Screen):
             "mix": {"icon": "mix.png", "bg": "#F25549", "hover": "#FF6A5E"}
         }
         
+        self._mode_buttons = {}
         for mode in ["addition", "subtraction", "multiplication", "division", "mix"]:
-            info = overview.get(mode, {})
-            best = info.get("best")
-            label = f"{mode.title()} — {best['score']}/{best['total']}" if best else f"{mode.title()} — None"
             config = mode_config[mode]
-            root.add_widget(IconRoundButton(
-                text=label, 
+            btn = IconRoundButton(
+                text=mode.title(),
                 icon_name=config["icon"],
                 bg_color=self._hex_to_rgba(config["bg"]), 
                 hover_color=self._hex_to_rgba(config["hover"]), 
                 on_release=lambda _i, m=mode: self._open_mode(m)
-            ))
+            )
+            self._mode_buttons[mode] = btn
+            root.add_widget(btn)
+        root.add_widget(IconRoundButton(text="Skill Drills", bg_color=self._hex_to_rgba("#10B6DF"), hover_color=self._hex_to_rgba("#3DD0F2"), on_release=lambda _i: self._show_drills()))
+        self._update_labels()
 
         root.add_widget(Widget())
         self.add_widget(root)
         self.root_layout = root
 
+    def _update_labels(self) -> None:
+        """Fill the mode buttons for the current view; only text changes, no rebuild."""
+        profile = get_active_profile()
+        for mode, btn in self._mode_buttons.items():
+            btn.text = self._mode_label(mode, profile)
+        self._toggle_btn.text = "Show Class Top 10" if self.view == "mine" else f"Show My Best ({profile})"
+        self._labels_profile = profile
+        self._stale = False
+
+    def _mode_label(self, mode: str, profile: str) -> str:
+        if self.view == "class":
+            top = self.service.get_leaderboard(mode, 1)
+            return f"{mode_title(mode)} — {top[0].name} {top[0].score}/{top[0].total}" if top else f"{mode_title(mode)} — None"
+        best = self.service.get_best(mode, profile=profile)
+        return f"{mode_title(mode)} — {best['score']}/{best['total']}" if best else f"{mode_title(mode)} — None"
+
+    def _toggle_view(self) -> None:
+        self.view = "class" if self.view == "mine" else "mine"
+        self._update_labels()
+
+    def _show_leaderboard(self, mode: str) -> None:
+        """Popup with the class top 10 for one mode"""
+        top = self.service.get_leaderboard(mode, 10)
+        lines = [f"{rank}. {entry.name} — {entry.score}/{entry.total}" for rank, entry in enumerate(top, start=1)]
+        self._show_list_popup(f"{mode_title(mode)} — Class Top 10", lines, "No scores yet!")
+
+    def _show_most_missed(self) -> None:
+        """Popup with the facts the class gets wrong most often, once the latest attempts are counted"""
+        get_fact_analytics().catch_up_later(self._open_most_missed)
+
+    def _open_most_missed(self) -> None:
+        lines = []
+        for stats in get_fact_analytics().most_missed("mix", 10):
+            avg = f", {stats['avg_ms'] / 1000:.1f}s" if stats["avg_ms"] is not None else ""
+            lines.append(f"{stats['problem'].replace(' = ?', '')} — missed {stats['missed']}/{stats['seen']}{avg}")
+        self._show_list_popup("Most Missed Facts", lines, "No missed facts yet!")
+
+    def _show_drills(self) -> None:
+        """Popup with a button for each drill mode that has been played; built on tap, not on enter"""
+        from kivy.uix.popup import Popup
+        from kivy.uix.button import Button
+
+        played = self.service.get_overview()
+        drills = [mode for mode in DRILL_MODES if mode in played]
+        profile = get_active_profile()
+        content = BoxLayout(orientation='vertical', padding=20, spacing=12)
+        popup = Popup(title="Skill Drills", title_size='20sp', title_align='center', content=content, size_hint=(0.85, None), height=140 + 62 * max(len(drills), 1))
+
+        def open_mode(mode):
+            popup.dismiss()
+            self._open_mode(mode)
+
+        for mode in drills:
+            btn = Button(text=self._mode_label(mode, profile), size_hint=(1, None), height=50, background_color=self._hex_to_rgba("#10B6DF"), color=(1, 1, 1, 1), bold=True, font_size=18)
+            btn.bind(on_release=lambda _i, m=mode: open_mode(m))
+            content.add_widget(btn)
+        if not drills:
+            content.add_widget(Label(text="No drills played yet!", font_size=18))
+        ok_button = Button(text='OK', size_hint=(1, None), height=50, background_color=self._hex_to_rgba("#76C043"), color=(1, 1, 1, 1), bold=True, font_size=20)
+        ok_button.bind(on_release=lambda _i: popup.dismiss())
+        content.add_widget(ok_button)
+        popup.open()
+
+    def _show_list_popup(self, title: str, lines: List[str], empty_text: str) -> None:
+        from kivy.uix.popup import Popup
+        from kivy.uix.button import Button
+
+        content = BoxLayout(orientation='vertical', padding=20, spacing=12)
+        content.add_widget(Label(text="\n".join(lines) or empty_text, font_size=18, halign='center', valign='top'))
+        ok_button = Button(text='OK', size_hint=(1, None), height=50, background_color=self._hex_to_rgba("#76C043"), color=(1, 1, 1, 1), bold=True, font_size=20)
+        content.add_widget(ok_button)
+        popup = Popup(title=title, title_size='20sp', title_align='center', content=content, size_hint=(0.85, None), height=460)
+        ok_button.bind(on_release=lambda _i: popup.dismiss())
+        popup.open()
+
     def _open_mode(self, mode: str) -> None:
+        if self.view == "class":
+            self._show_leaderboard(mode)
+            return
         from .mode_logs import ModeLogsScreen  # type: ignore
         screen_name = f"mode_logs_{mode}"
-        # Replace old instance to refresh
-        if screen_name in getattr(self.navigator, "_screens", {}):
-            try:
-                old = self.navigator._screens.pop(screen_name)
-                self.navigator.screen_manager.remove_widget(old)
-            except Exception:
-                pass
-        self.navigator.register_screen(screen_name, lambda name, navigator: ModeLogsScreen(name=name, navigator=navigator, mode=mode))
-        self.navigator.show(screen_name)
+        # A fresh instance so it shows the latest best
+        self.navigator.replace(screen_name, lambda name, navigator: ModeLogsScreen(name=name, navigator=navigator, mode=mode))
 
     def _hex_to_rgba(self, hex_color: str, alpha: float = 1.0):
         hex_color = hex_color.lstrip('#')
@@ -45,19 +45,17 @@ class HomeScreen(Screen):
 
 		self.add_widget(root)
 
+	def on_enter(self, *_):
+		# Likely next screens get built in idle frames while the learner decides
+		self.navigator.prewarm(("quiz", "scores", "learn"))
+
 	def _go_learn(self) -> None:
-		from .learn import LearnScreen  # type: ignore
-		self.navigator.register_screen("learn", LearnScreen)
 		self.navigator.show("learn")
 
 	def _go_quiz(self) -> None:
-		from .quiz import QuizScreen  # type: ignore
-		self.navigator.register_screen("quiz", QuizScreen)
 		self.navigator.show("quiz")
 
 	def _go_scores(self) -> None:
-		from .high_scores import HighScoresScreen  # type: ignore
-		self.navigator.register_screen("scores", HighScoresScreen)
 		self.navigator.show("scores")
 
 	def _exit_app(self) -> None:
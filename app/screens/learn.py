@@ -54,8 +54,6 @@ class LearnScreen(Screen):
 		self.add_widget(root)
 
 	def _open_topic(self, topic: str) -> None:
-		from .lesson import LessonScreen  # type: ignore
-		self.navigator.register_screen("lesson", LessonScreen)
 		self.navigator.show_with_context("lesson", topic=topic)
 
 	def _hex_to_rgba(self, hex_color: str, alpha: float = 1.0):
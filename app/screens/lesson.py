@@ -1,17 +1,9 @@
-import tkinter as tk
-from tkinter import messagebox
-import sys
-import os
-import webbrowser
-from pathlib import Path
-
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.image import Image
 from kivy.uix.label import Label
 from kivy.uix.widget import Widget
-from kivy.uix.video import Video
 from kivy.graphics import Color, RoundedRectangle, Ellipse
 from kivy.core.window import Window
 from kivy.clock import Clock
@@ -166,6 +158,9 @@ class VideoSeekBar(Widget):
 
 
 class LessonScreen(Screen):
+	# The decoded video and its textures make this the heaviest screen to keep alive
+	cache_weight = 3
+
 	def __init__(self, name: str, navigator, **kwargs):
 		super().__init__(name=name, **kwargs)
 		self.navigator = navigator
@@ -188,8 +183,9 @@ class LessonScreen(Screen):
 		header = BoxLayout(orientation="horizontal", size_hint=(1, None), height=52)
 		header.add_widget(BackCircleButton(diameter=40, icon_name="back_white.png", on_release=lambda _i: self._back_to_learn()))
 		header.add_widget(Widget())
-		logo_path = str(get_assets_dir() / "images" / "logo.png")
-		header.add_widget(Image(source=logo_path, size_hint=(None, None), size=(140, 60)))
+		logo_path = resolve_image_path("logo.png")
+		if logo_path:
+			header.add_widget(Image(source=logo_path, size_hint=(None, None), size=(140, 60)))
 		root.add_widget(header)
 
 
@@ -212,7 +208,8 @@ class LessonScreen(Screen):
 		self.poster = Image(source="", allow_stretch=True, keep_ratio=True, size_hint=(1, 1), pos_hint={"x": 0, "y": 0})
 		inner.add_widget(self.poster)
 
-		# Video widget (fit inside container)
+		# Video widget (fit inside container); the video provider is only loaded with this screen
+		from kivy.uix.video import Video
 		self.video_widget = Video(
 			source="", 
 			state="stop", 
@@ -535,6 +532,12 @@ class LessonScreen(Screen):
 	def on_pre_leave(self, *_):
 		self._stop_video()
 
+	def on_evict(self) -> None:
+		"""Called by the Navigator before this screen is dropped: free the video decoder."""
+		self._stop_video()
+		if self.video_widget is not None:
+			self.video_widget.unload()
+
 	def _back_to_learn(self) -> None:
 		self._stop_video()
 		self.navigator.show("learn")
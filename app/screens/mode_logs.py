@@ -2,22 +2,42 @@ from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.image import Image
-from kivy.uix.scrollview import ScrollView
-from kivy.uix.gridlayout import GridLayout
+from kivy.uix.widget import Widget
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.properties import StringProperty, ListProperty, NumericProperty
 from kivy.lang import Builder
 from ..ui.widgets.buttons import BackCircleButton
-from ..services.high_score_service import HighScoreService
-from ..utils.assets import resolve_image_path
+from ..services.fact_index import mode_title
+from ..services.high_score_service import get_high_score_service
+from ..services.profiles import get_active_profile
+from ..services.log_codec import decode_questions
+from ..utils.assets import resolve_icon
 import os
 
-# Load the KV file
-kv_path = os.path.join(os.path.dirname(__file__), 'mode_logs.kv')
-Builder.load_file(kv_path)
+_kv_loaded = False
 
 
-class QuestionCard(BoxLayout):
-	"""A single question card showing the question, answers, and result."""
+def _load_kv() -> None:
+	"""Load the QuestionCard rules once, when the first logs screen is built."""
+	global _kv_loaded
+	if not _kv_loaded:
+		Builder.load_file(os.path.join(os.path.dirname(__file__), 'mode_logs.kv'))
+		_kv_loaded = True
+
+
+# Every row's view attributes come from the question log itself, so all rows share
+# one empty data dict and the list costs a pointer per question
+_ROW = {}
+
+
+class QuestionCard(RecycleDataViewBehavior, BoxLayout):
+	"""A single question card showing the question, answers, and result.
+
+	Cards are recycled by QuestionList: only the visible ones exist, and scrolling
+	re-fills them from the log instead of creating new widgets.
+	"""
 	
 	# Properties that will be used in the KV file
 	index = NumericProperty(0)
@@ -30,15 +50,16 @@ class QuestionCard(BoxLayout):
 	border_color = ListProperty([0, 0, 0, 1])
 	your_box_color = ListProperty([0, 0, 0, 1])
 	
-	def __init__(self, question_data, index, is_correct, icons, **kwargs):
-		# Set properties before calling super().__init__
-		self.index = index
+	def refresh_view_attrs(self, rv, index, data):
+		question_data = rv.questions[index]
+		icons = rv.icons
+		self.index = index + 1
 		self.question_text = question_data.get('problem', '')
 		self.your_answer = str(question_data.get('user', ''))
 		self.correct_answer = str(question_data.get('answer', ''))
 		
 		# Set colors and icons
-		if is_correct:
+		if question_data.get('correct'):
 			self.border_color = [0.13, 0.70, 0.00, 1]
 			self.your_box_color = [0.13, 0.70, 0.00, 1]
 			self.status_text = '[b]CORRECT![/b]'
@@ -50,16 +71,30 @@ class QuestionCard(BoxLayout):
 			self.status_text = '[b]WRONG[/b]'
 			self.top_icon = icons['bulb'] or ''  # Lightbulb at top
 			self.status_icon = icons['sad'] or ''  # Sad at bottom
-		
+		return super().refresh_view_attrs(rv, index, data)
+
+
+class QuestionList(RecycleView):
+	"""Virtualized list of QuestionCards over a question log (decoded row by row)."""
+
+	def __init__(self, questions, icons, **kwargs):
 		super().__init__(**kwargs)
+		self.questions = questions
+		self.icons = icons
+		self.viewclass = QuestionCard
+		layout = RecycleBoxLayout(orientation='vertical', default_size=(None, 180), default_size_hint=(1, None), size_hint_y=None, spacing=15, padding=[0, 10, 0, 8])
+		layout.bind(minimum_height=layout.setter('height'))
+		self.add_widget(layout)
+		self.data = [_ROW] * len(questions)
 
 
 class ModeLogsScreen(Screen):
 	def __init__(self, name: str, navigator, mode: str, **kwargs):
+		_load_kv()
 		super().__init__(name=name, **kwargs)
 		self.navigator = navigator
 		self.mode = mode
-		self.service = HighScoreService()
+		self.service = get_high_score_service()
 
 		root = BoxLayout(orientation="vertical", padding=[16, 16, 16, 16], spacing=12)
 		root.add_widget(BackCircleButton(diameter=40, icon_name="back_white.png", on_release=lambda _i: self.navigator.show("scores")))
@@ -72,10 +107,10 @@ class ModeLogsScreen(Screen):
 			"division": "[color=F2AB0C][b]DIVISION[/b][/color]",
 			"mix": "[color=F25549][b]MIX[/b][/color]"
 		}
-		mode_title = mode_titles.get(mode, mode.upper())
-		root.add_widget(Label(text=mode_title, markup=True, font_size=28, bold=True, size_hint_y=None, height=40))
+		title = mode_titles.get(mode, mode_title(mode).upper())
+		root.add_widget(Label(text=title, markup=True, font_size=28, bold=True, size_hint_y=None, height=40))
 
-		best = self.service.get_best(mode)
+		best = self.service.get_best(mode, profile=get_active_profile())
 		
 		# Date/time stamp in blue
 		from datetime import datetime, timedelta
@@ -103,23 +138,16 @@ class ModeLogsScreen(Screen):
 			score_text = f"[b]{score} out of {total}[/b]"
 			root.add_widget(Label(text=score_text, markup=True, font_size=30, size_hint_y=None, height=45, color=(0.2, 0.2, 0.2, 1)))
 
-		scroll = ScrollView(size_hint=(1, 1))
-		grid = GridLayout(cols=1, size_hint_y=None, spacing=15, padding=[0, 10, 0, 8])
-		grid.bind(minimum_height=grid.setter('height'))
-
-		if best and best.get("questions"):
+		questions = decode_questions(best.get("questions")) if best else []
+		if questions:
 			# Preload icon paths
 			icons = {
-				'star': resolve_image_path("star.png"),
-				'bulb': resolve_image_path("lightbulb.png"),
-				'party': resolve_image_path("party.png"),
-				'sad': resolve_image_path("sad.png")
+				'star': resolve_icon("star.png"),
+				'bulb': resolve_icon("lightbulb.png"),
+				'party': resolve_icon("party.png"),
+				'sad': resolve_icon("sad.png")
 			}
-			
-			for idx, q in enumerate(best.get("questions", []), start=1):
-				is_correct = bool(q.get("correct"))
-				card = QuestionCard(q, idx, is_correct, icons)
-				grid.add_widget(card)
+			root.add_widget(QuestionList(questions, icons, size_hint=(1, 1)))
 		else:
 			# Friendly message for kids when no data available
 			no_data_container = BoxLayout(orientation='vertical', spacing=30, padding=[20, 100, 20, 20], size_hint_y=None, height=400)
@@ -136,8 +164,7 @@ class ModeLogsScreen(Screen):
 			message_label.bind(size=lambda inst, _: setattr(inst, 'text_size', inst.size))
 			no_data_container.add_widget(message_label)
 			
-			grid.add_widget(no_data_container)
+			root.add_widget(no_data_container)
+			root.add_widget(Widget())
 
-		scroll.add_widget(grid)
-		root.add_widget(scroll)
 		self.add_widget(root)
\ No newline at end of file
@@ -3,9 +3,12 @@ from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.image import Image
 from kivy.uix.widget import Widget
+from kivy.uix.textinput import TextInput
 from ..ui import theme
 from ..ui.widgets.buttons import IconRoundButton, BackCircleButton
 from ..utils.assets import resolve_image_path
+from ..services.fact_index import DRILL_MODES, mode_title
+from ..services.profiles import get_active_profile, set_active_profile
 
 
 class QuizScreen(Screen):
@@ -36,28 +39,54 @@ class QuizScreen(Screen):
         else:
             root.add_widget(Label(text="[color=FF6F61][b]QUIZ\nGAMES[/b][/color]", markup=True, font_size=26))
 
+        # Who is playing - scores and practice are kept per learner
+        self.name_input = TextInput(text=get_active_profile(), hint_text="Your name", multiline=False, halign="center", font_size=18, size_hint=(0.8, None), height=44, pos_hint={'center_x': 0.5})
+        self.name_input.bind(on_text_validate=lambda _i: self._set_profile())
+        self.name_input.bind(focus=lambda _i, focused: None if focused else self._set_profile())
+        root.add_widget(self.name_input)
+
         # Mode buttons
         root.add_widget(IconRoundButton(text="Addition", icon_name="addition.png", bg_color=self._hex_to_rgba("#76C043"), hover_color=self._hex_to_rgba("#7FD04A"), on_release=lambda _i: self._start_mode("addition")))
         root.add_widget(IconRoundButton(text="Subtraction", icon_name="minus.png", bg_color=self._hex_to_rgba("#8E66E3"), hover_color=self._hex_to_rgba("#9A74EE"), on_release=lambda _i: self._start_mode("subtraction")))
         root.add_widget(IconRoundButton(text="Multiplication", icon_name="times.png", bg_color=self._hex_to_rgba("#11B3D9"), hover_color=self._hex_to_rgba("#1AC2EA"), on_release=lambda _i: self._start_mode("multiplication")))
         root.add_widget(IconRoundButton(text="Division", icon_name="divide.png", bg_color=self._hex_to_rgba("#F2AB0C"), hover_color=self._hex_to_rgba("#FFC326"), on_release=lambda _i: self._start_mode("division")))
         root.add_widget(IconRoundButton(text="Mix", icon_name="mix.png", bg_color=self._hex_to_rgba("#F25549"), hover_color=self._hex_to_rgba("#FF6A5E"), on_release=lambda _i: self._start_mode("mix")))
+        # Targeted practice (carrying, borrowing, doubles) from the fact index
+        root.add_widget(IconRoundButton(text="Skill Drills", bg_color=self._hex_to_rgba("#10B6DF"), hover_color=self._hex_to_rgba("#3DD0F2"), on_release=lambda _i: self._show_drills()))
 
         root.add_widget(Widget())
         self.add_widget(root)
 
+    def _set_profile(self) -> None:
+        self.name_input.text = set_active_profile(self.name_input.text)
+
     def _start_mode(self, mode: str) -> None:
         from .quiz_play import QuizPlayScreen  # type: ignore
+        self._set_profile()
         screen_name = f"quiz_play_{mode}"
-        # If an old instance exists, remove it to start fresh at Question 1
-        if screen_name in getattr(self.navigator, "_screens", {}):
-            try:
-                old = self.navigator._screens.pop(screen_name)
-                self.navigator.screen_manager.remove_widget(old)
-            except Exception:
-                pass
-        self.navigator.register_screen(screen_name, lambda name, navigator: QuizPlayScreen(name=name, navigator=navigator, mode=mode))
-        self.navigator.show(screen_name)
+        # A fresh instance so the quiz starts at Question 1
+        self.navigator.replace(screen_name, lambda name, navigator: QuizPlayScreen(name=name, navigator=navigator, mode=mode))
+
+    def _show_drills(self) -> None:
+        """Popup with one button per drill mode"""
+        from kivy.uix.popup import Popup
+        from kivy.uix.button import Button
+
+        content = BoxLayout(orientation='vertical', padding=20, spacing=12)
+        popup = Popup(title="Skill Drills", title_size='20sp', title_align='center', content=content, size_hint=(0.85, None), height=140 + 62 * len(DRILL_MODES))
+
+        def start(mode):
+            popup.dismiss()
+            self._start_mode(mode)
+
+        for mode in DRILL_MODES:
+            btn = Button(text=mode_title(mode), size_hint=(1, None), height=50, background_color=self._hex_to_rgba("#10B6DF"), color=(1, 1, 1, 1), bold=True, font_size=20)
+            btn.bind(on_release=lambda _i, m=mode: start(m))
+            content.add_widget(btn)
+        cancel_button = Button(text='Cancel', size_hint=(1, None), height=50, background_color=self._hex_to_rgba("#F25549"), color=(1, 1, 1, 1), bold=True, font_size=20)
+        cancel_button.bind(on_release=lambda _i: popup.dismiss())
+        content.add_widget(cancel_button)
+        popup.open()
 
     def _hex_to_rgba(self, hex_color: str, alpha: float = 1.0):
         hex_color = hex_color.lstrip('#')
@@ -1,5 +1,3 @@
-import random
-from typing import Tuple, Dict, Any
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
@@ -9,7 +7,8 @@ from kivy.uix.image import Image
 from kivy.graphics import Color, RoundedRectangle, Line
 from ..ui.widgets.buttons import IconRoundButton, BackCircleButton
 from ..ui import theme
-from ..services.high_score_service import HighScoreService
+from ..services.fact_index import mode_title
+from ..services.quiz_session import QuizSession
 from ..utils.assets import resolve_image_path
 
 
@@ -18,12 +17,7 @@ class QuizPlayScreen(Screen):
         super().__init__(name=name, **kwargs)
         self.navigator = navigator
         self.mode = mode
-        self.question_index = 0
-        self.correct = 0
-        self.current_answer = None
-        self.current_problem = ""
-        self._checked_current = False
-        self._logs: list[Dict[str, Any]] = []
+        self.session = QuizSession(mode)
 
         root = BoxLayout(orientation="vertical", padding=[16, 16, 16, 16], spacing=12)
 
@@ -123,93 +117,54 @@ class QuizPlayScreen(Screen):
         self._btn_finish.disabled = not enabled
 
     def _back(self) -> None:
+        self.session.save_progress()
         self.navigator.show("quiz")
 
-    def _gen_question(self) -> Tuple[str, int]:
-        mode = self.mode
-        if mode == "mix":
-            mode = random.choice(["addition", "subtraction", "multiplication", "division"]) 
-        if mode == "addition":
-            a = random.randint(1, 99)
-            b = random.randint(1, 99)
-            return f"{a} + {b} = ?", a + b
-        if mode == "subtraction":
-            a = random.randint(1, 99)
-            b = random.randint(1, 99)
-            if b > a:
-                a, b = b, a
-            return f"{a} - {b} = ?", a - b
-        if mode == "multiplication":
-            a = random.randint(1, 9)
-            b = random.randint(1, 9)
-            return f"{a} × {b} = ?", a * b
-        if mode == "division":
-            candidates = [(a, b) for a in range(1, 10) for b in range(1, 10) if a % b == 0]
-            a, b = random.choice(candidates)
-            return f"{a} ÷ {b} = ?", a // b
-        raise ValueError("Unknown mode")
-
     def _check(self) -> None:
-        if self._checked_current:
+        if self.session.checked:
             return
         text = self.answer_input.text.strip()
         if not text.isdigit():
             self.feedback_label.text = "Enter a Valid Number!"
             self.feedback_label.color = self._hex_to_rgba("#F2AB0C")
-            self._checked_current = False
             self._set_nav_enabled(False)
             return
-        user = int(text)
-        correct_now = user == self.current_answer
-        if correct_now:
+        if self.session.check(int(text)):
             self.feedback_label.text = "Correct!"
             self.feedback_label.color = self._hex_to_rgba("#3DAA3C")
-            self.correct += 1
         else:
-            self.feedback_label.text = f"X Wrong! Correct: {self.current_answer}"
+            self.feedback_label.text = f"X Wrong! Correct: {self.session.current_answer}"
             self.feedback_label.color = self._hex_to_rgba("#E53935")
-        self._checked_current = True
         self._set_nav_enabled(True)
         self.answer_input.readonly = True
-        self._logs.append({
-            "problem": self.current_problem,
-            "answer": self.current_answer,
-            "user": user,
-            "correct": bool(correct_now),
-        })
 
     def _next_guarded(self) -> None:
-        if not self._checked_current:
+        if not self.session.checked:
             self.feedback_label.text = "Please check your answer first!"
             self.feedback_label.color = self._hex_to_rgba("#F2AB0C")
             return
         self._next()
 
     def _next(self) -> None:
-        self.question_index += 1
-        self.question_label.text = f"Question {self.question_index}"
-        problem, answer = self._gen_question()
-        self.current_answer = answer
-        self.current_problem = problem
-        self.problem_label.text = problem
+        question = self.session.next()
+        self.question_label.text = f"Question {self.session.question_index}"
+        self.problem_label.text = question.problem
         self.answer_input.readonly = False
         self.answer_input.text = ""
         self.feedback_label.text = ""
-        self._checked_current = False
         self._set_nav_enabled(False)
         # Focus the input so the user can type immediately
         self.answer_input.focus = True
 
     def _finish_guarded(self) -> None:
-        if not self._checked_current:
+        if not self.session.checked:
             self.feedback_label.text = "Please check your answer first!"
             self.feedback_label.color = self._hex_to_rgba("#F2AB0C")
             return
         self._finish()
 
     def _finish(self) -> None:
-        service = HighScoreService()
-        is_new_high_score = service.record_attempt(self.mode, score=self.correct, total=self.question_index, questions=self._logs)
+        is_new_high_score = self.session.finish()
         
         # Show popup if it's a new high score
         if is_new_high_score:
@@ -229,7 +184,7 @@ class QuizPlayScreen(Screen):
         
         # Congratulations message
         content.add_widget(Label(
-            text=f"[color=FFD700][size=32][b] NEW HIGH SCORE!!! [/b][/size][/color]\n\n[size=24]You scored [b]{self.correct}/{self.question_index}[/b]\nin [b]{self.mode.title()}[/b] mode![/size]",
+            text=f"[color=FFD700][size=32][b] NEW HIGH SCORE!!! [/b][/size][/color]\n\n[size=24]You scored [b]{self.session.correct}/{self.session.question_index}[/b]\nin [b]{mode_title(self.mode)}[/b] mode![/size]",
             markup=True,
             halign='center',
             valign='center'
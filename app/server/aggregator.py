@@ -0,0 +1,197 @@
+"""
+Classroom aggregation server: collects attempts uploaded by the devices' SyncClient.
+
+Run from the project root:
+    python -m app.server.aggregator [--host 0.0.0.0] [--port 8765] [--db classroom.db]
+
+POST /attempts   gzip (or plain) JSON {"device": ..., "attempts": [...]}; replies with
+                 {"received", "added", "rejected": [ids of malformed attempts, not stored]}
+GET  /summary    per-learner, per-mode best scores across all devices
+GET  /health
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import gzip
+import json
+import sqlite3
+import threading
+
+MAX_BODY = 16 * 1024 * 1024
+
+_ATTEMPTS_TABLE = """CREATE TABLE IF NOT EXISTS {name} (
+	device TEXT NOT NULL,
+	id TEXT PRIMARY KEY,
+	profile TEXT NOT NULL,
+	mode TEXT NOT NULL,
+	score INTEGER NOT NULL,
+	total INTEGER NOT NULL,
+	timestamp TEXT NOT NULL,
+	questions TEXT NOT NULL
+)"""
+
+
+def _attempt_key(device: str, attempt_id: str) -> str:
+	return f"{device}/{attempt_id}" if attempt_id.startswith("legacy-") else attempt_id
+
+
+class AttemptStore:
+	"""SQLite table of every attempt received; an attempt id is stored only once.
+
+	Attempt ids are uuid4s, so they are unique across devices: an attempt re-uploaded
+	under another device id (a reset sync_state.json, or attempts imported from
+	another device's export) is still counted once. The one exception is the
+	"legacy-..." ids given to bests migrated from before the journal existed; those
+	are only unique per device, so they are stored prefixed with the device id.
+	"""
+
+	def __init__(self, path: str = ":memory:") -> None:
+		self._lock = threading.Lock()
+		self._db = sqlite3.connect(path, check_same_thread=False)
+		self._db.execute("PRAGMA journal_mode=WAL")
+		self._migrate_device_key()
+		self._db.execute(_ATTEMPTS_TABLE.format(name="attempts"))
+		self._db.execute("CREATE INDEX IF NOT EXISTS attempts_profile_mode ON attempts (profile, mode, score)")
+		self._db.commit()
+
+	def _migrate_device_key(self) -> None:
+		"""Re-key databases created when the primary key was (device, id)."""
+		pk = [row[1] for row in self._db.execute("PRAGMA table_info(attempts)") if row[5]]
+		if pk != ["device", "id"]:
+			return
+		with self._db:
+			self._db.execute(_ATTEMPTS_TABLE.format(name="attempts_by_id"))
+			self._db.execute(
+				"INSERT OR IGNORE INTO attempts_by_id SELECT device,"
+				" CASE WHEN id LIKE 'legacy-%' THEN device || '/' || id ELSE id END,"
+				" profile, mode, score, total, timestamp, questions FROM attempts ORDER BY rowid"
+			)
+			self._db.execute("DROP TABLE attempts")
+			self._db.execute("ALTER TABLE attempts_by_id RENAME TO attempts")
+
+	def add(self, device: str, attempts: List[Dict[str, Any]]) -> Tuple[int, List[Any]]:
+		"""Insert a batch in one transaction. Returns how many were new, and the ids of
+		attempts too malformed to store (the rest of the batch is still stored)."""
+		rows = []
+		rejected = []
+		for a in attempts:
+			try:
+				rows.append((
+					device,
+					_attempt_key(device, str(a["id"])),
+					str(a.get("profile", "default")),
+					str(a["mode"]),
+					int(a["score"]),
+					int(a.get("total", 0)),
+					str(a.get("timestamp", "")),
+					json.dumps(a.get("questions", [])),
+				))
+			except (AttributeError, KeyError, TypeError, ValueError):
+				rejected.append(a.get("id") if isinstance(a, dict) else None)
+		with self._lock:
+			before = self._db.total_changes
+			with self._db:
+				self._db.executemany("INSERT OR IGNORE INTO attempts VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+			return self._db.total_changes - before, rejected
+
+	def count(self) -> int:
+		with self._lock:
+			return self._db.execute("SELECT COUNT(*) FROM attempts").fetchone()[0]
+
+	def summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+		with self._lock:
+			rows = self._db.execute(
+				"SELECT profile, mode, MAX(score), total, COUNT(*) FROM attempts GROUP BY profile, mode"
+			).fetchall()
+		out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+		for profile, mode, best, total, attempts in rows:
+			out.setdefault(profile, {})[mode] = {"best": best, "total": total, "attempts": attempts}
+		return out
+
+	def close(self) -> None:
+		with self._lock:
+			self._db.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+	server: "AggregationServer"
+
+	def _reply(self, status: int, payload: Any) -> None:
+		body = json.dumps(payload).encode("utf-8")
+		self.send_response(status)
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def do_GET(self) -> None:
+		if self.path == "/health":
+			self._reply(200, {"ok": True, "attempts": self.server.store.count()})
+		elif self.path == "/summary":
+			self._reply(200, self.server.store.summary())
+		else:
+			self._reply(404, {"error": "not found"})
+
+	def do_POST(self) -> None:
+		if self.path != "/attempts":
+			self._reply(404, {"error": "not found"})
+			return
+		length = int(self.headers.get("Content-Length") or 0)
+		if length <= 0 or length > MAX_BODY:
+			self._reply(413, {"error": "body missing or too large"})
+			return
+		try:
+			body = self.rfile.read(length)
+			if self.headers.get("Content-Encoding") == "gzip":
+				body = gzip.decompress(body)
+			payload = json.loads(body)
+			if not isinstance(payload["attempts"], list):
+				raise TypeError("attempts must be a list")
+			added, rejected = self.server.store.add(str(payload["device"]), payload["attempts"])
+		except (OSError, ValueError, KeyError, TypeError) as exc:
+			self._reply(400, {"error": str(exc)})
+			return
+		self._reply(200, {"received": len(payload["attempts"]), "added": added, "rejected": rejected})
+
+	def log_message(self, format: str, *args: Any) -> None:
+		if not self.server.quiet:
+			super().log_message(format, *args)
+
+
+class AggregationServer(ThreadingHTTPServer):
+	daemon_threads = True
+
+	def __init__(self, host: str = "127.0.0.1", port: int = 8765, db: str = ":memory:", quiet: bool = False) -> None:
+		self.store = AttemptStore(db)
+		self.quiet = quiet
+		super().__init__((host, port), _Handler)
+
+	@property
+	def url(self) -> str:
+		host, port = self.server_address[:2]
+		return f"http://{host}:{port}"
+
+	def server_close(self) -> None:
+		super().server_close()
+		self.store.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+	parser = argparse.ArgumentParser(description="Collect quiz attempts from classroom devices.")
+	parser.add_argument("--host", default="0.0.0.0")
+	parser.add_argument("--port", type=int, default=8765)
+	parser.add_argument("--db", default="classroom.db")
+	args = parser.parse_args(argv)
+	server = AggregationServer(args.host, args.port, args.db)
+	print(f"Collecting attempts on {server.url} into {args.db}")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,217 @@
+"""
+Live classroom drill: one seeded question stream pushed to every connected device.
+
+Run from the project root:
+    python -m app.server.live [--mode mix] [--questions 20] [--time-limit 8] [--expect 30]
+
+Protocol: newline-delimited JSON over TCP.
+    client -> {"join": "<name>"}
+    server -> {"type": "welcome", "mode": ..., "questions": ..., "seed": ...}
+    server -> {"type": "question", "index": i, "problem": "7 × 8 = ?", "time_limit": s}
+    client -> {"index": i, "answer": 56}
+    server -> {"type": "scoreboard", "index": i, "top": [[name, score], ...]}
+    server -> {"type": "end", "top": [...], "answers": n}
+Only a client's first answer to the open question counts. Each answer is timed
+on the server from when the question went out.
+"""
+from __future__ import annotations
+from typing import Any, Dict, IO, List, Optional, Set
+import argparse
+import asyncio
+import json
+import random
+import sys
+from ..models.high_score import HighScore
+from ..services.leaderboard import Leaderboard
+from ..services.question_bank import Question, QuestionBuffer
+
+LINE_LIMIT = 1024
+# A client whose socket backs up past this is dropped rather than buffered for
+MAX_WRITE_BUFFER = 64 * 1024
+MAX_CLIENTS = 2000
+SCOREBOARD_SIZE = 10
+
+
+def _line(payload: Dict[str, Any]) -> bytes:
+	return json.dumps(payload, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class _Client:
+	__slots__ = ("name", "writer", "score", "answered", "answered_ms", "last_index")
+
+	def __init__(self, name: str, writer: asyncio.StreamWriter) -> None:
+		self.name = name
+		self.writer = writer
+		self.score = 0
+		self.answered = 0
+		self.answered_ms = 0
+		self.last_index = -1
+
+
+class LiveDrill:
+	"""One synchronized drill. Memory per client is constant; answers are not kept
+	in memory but may be streamed to `answer_log` as JSON lines."""
+
+	def __init__(self, mode: str = "mix", questions: int = 20, time_limit: float = 8.0, seed: Optional[int] = None, answer_log: Optional[IO[str]] = None) -> None:
+		self.mode = mode
+		self.questions = questions
+		self.time_limit = time_limit
+		self.seed = seed if seed is not None else random.randrange(2 ** 31)
+		self.answer_log = answer_log
+		self.answers = 0
+		self.scoreboard = Leaderboard(SCOREBOARD_SIZE)
+		self._buffer = QuestionBuffer(mode, batch_size=questions, seed=self.seed)
+		self._clients: Dict[str, _Client] = {}
+		self._current: Optional[Question] = None
+		self._index = -1
+		self._opened_at = 0.0
+		self._handlers: Set[asyncio.Task] = set()
+		self._finished = asyncio.Event()
+
+	@property
+	def client_count(self) -> int:
+		return len(self._clients)
+
+	def _send(self, client: _Client, data: bytes) -> None:
+		transport = client.writer.transport
+		if transport.is_closing() or transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+			self._drop(client)
+			return
+		client.writer.write(data)
+
+	def _broadcast(self, payload: Dict[str, Any]) -> None:
+		data = _line(payload)  # encoded once for everyone
+		for client in list(self._clients.values()):
+			self._send(client, data)
+
+	def _drop(self, client: _Client) -> None:
+		if self._clients.get(client.name) is client:
+			del self._clients[client.name]
+		client.writer.close()
+
+	def _top(self) -> List[List[Any]]:
+		return [[entry.name, entry.score] for entry in self.scoreboard.top(SCOREBOARD_SIZE)]
+
+	def _answer(self, client: _Client, message: Dict[str, Any]) -> None:
+		index = message.get("index")
+		if self._current is None or index != self._index or client.last_index == index:
+			return
+		loop = asyncio.get_running_loop()
+		elapsed_ms = int((loop.time() - self._opened_at) * 1000)
+		try:
+			value = int(message.get("answer"))
+		except (TypeError, ValueError):
+			return
+		client.last_index = index
+		correct = value == self._current.answer
+		client.answered += 1
+		client.answered_ms += elapsed_ms
+		self.answers += 1
+		if correct:
+			client.score += 1
+			# Zero-padded so that on equal scores whoever got there first ranks higher
+			self.scoreboard.offer(HighScore(client.name, client.score, self.questions, f"{index:06d}{elapsed_ms:09d}"))
+		if self.answer_log is not None:
+			self.answer_log.write(json.dumps({"name": client.name, "index": index, "answer": value, "correct": correct, "ms": elapsed_ms}) + "\n")
+
+	async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+		client: Optional[_Client] = None
+		task = asyncio.current_task()
+		self._handlers.add(task)
+		try:
+			line = await reader.readline()
+			name = str(json.loads(line).get("join", "")).strip()[:32]
+			if not name or name in self._clients or len(self._clients) >= MAX_CLIENTS:
+				writer.write(_line({"type": "rejected"}))
+				return
+			client = _Client(name, writer)
+			self._clients[name] = client
+			self._send(client, _line({"type": "welcome", "mode": self.mode, "questions": self.questions, "seed": self.seed}))
+			while not self._finished.is_set():
+				line = await reader.readline()
+				if not line:
+					break
+				message = json.loads(line)
+				if isinstance(message, dict):
+					self._answer(client, message)
+		except (ValueError, AttributeError, ConnectionError, asyncio.LimitOverrunError):
+			pass
+		finally:
+			if client is not None:
+				self._drop(client)
+			else:
+				writer.close()
+			self._handlers.discard(task)
+
+	async def run(self, expect: int = 0, wait: float = 60.0) -> None:
+		"""Wait for `expect` devices (or `wait` seconds), then run every question."""
+		loop = asyncio.get_running_loop()
+		deadline = loop.time() + wait
+		while self.client_count < expect and loop.time() < deadline:
+			await asyncio.sleep(0.05)
+		for index in range(self.questions):
+			self._index = index
+			self._current = self._buffer.next()
+			self._opened_at = loop.time()
+			self._broadcast({"type": "question", "index": index, "problem": self._current.problem, "time_limit": self.time_limit})
+			await asyncio.sleep(self.time_limit)
+			self._current = None
+			self._broadcast({"type": "scoreboard", "index": index, "top": self._top()})
+		self._finished.set()
+		self._broadcast({"type": "end", "top": self._top(), "answers": self.answers})
+		for client in list(self._clients.values()):
+			try:
+				await client.writer.drain()
+			except ConnectionError:
+				pass
+			self._drop(client)
+		# Let every connection see its EOF instead of being cancelled at shutdown
+		await asyncio.gather(*self._handlers, return_exceptions=True)
+
+
+async def serve(drill: LiveDrill, host: str, port: int, expect: int, wait: float) -> None:
+	server = await asyncio.start_server(drill.handle, host, port, limit=LINE_LIMIT, backlog=1024)
+	# Printed only once connections are accepted; scripts wait for this line
+	print(f"Live drill on port {port}: {drill.questions} {drill.mode} questions, seed {drill.seed}", flush=True)
+	async with server:
+		await drill.run(expect, wait)
+
+
+def _peak_rss_kb() -> Optional[int]:
+	try:
+		import resource
+	except ImportError:
+		return None
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+	parser = argparse.ArgumentParser(description="Run a synchronized class drill over TCP.")
+	parser.add_argument("--host", default="0.0.0.0")
+	parser.add_argument("--port", type=int, default=8766)
+	parser.add_argument("--mode", default="mix")
+	parser.add_argument("--questions", type=int, default=20)
+	parser.add_argument("--time-limit", type=float, default=8.0)
+	parser.add_argument("--seed", type=int)
+	parser.add_argument("--expect", type=int, default=0, help="start as soon as this many devices have joined")
+	parser.add_argument("--wait", type=float, default=60.0, help="start after this many seconds regardless")
+	parser.add_argument("--answers", help="append every answer to this JSON-lines file")
+	args = parser.parse_args(argv)
+
+	log = open(args.answers, "a", encoding="utf-8") if args.answers else None
+	drill = LiveDrill(args.mode, args.questions, args.time_limit, args.seed, log)
+	try:
+		asyncio.run(serve(drill, args.host, args.port, args.expect, args.wait))
+	except KeyboardInterrupt:
+		pass
+	finally:
+		if log is not None:
+			log.close()
+	for rank, entry in enumerate(drill.scoreboard.top(SCOREBOARD_SIZE), 1):
+		print(f"{rank:>2}. {entry.name}: {entry.score}/{args.questions}")
+	print(f"answers: {drill.answers}, peak RSS: {_peak_rss_kb()} KB", flush=True)
+
+
+if __name__ == "__main__":
+	main()
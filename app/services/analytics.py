@@ -0,0 +1,229 @@
+"""
+Per-fact and per-mode counters folded from the attempt history as it grows.
+
+Run from the project root:
+    python -m app.services.analytics rebuild
+    python -m app.services.analytics most-missed [mode] [n]
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from pathlib import Path
+import argparse
+import threading
+from ..config.paths import get_analytics_path
+from ..models.high_score import HighScore
+from ..utils.json_store import dumps_chunked, read_json, write_bytes_atomic
+from .high_score_service import DEFAULT_PROFILE, get_high_score_service
+from .leaderboard import Leaderboard
+from .log_codec import QuestionLog
+from .mastery import fact_key, question_from_key
+from .question_bank import BASE_MODES, SYMBOLS, Question, make_question
+from .write_behind import WriteBehindQueue, flush_pending_writes, get_write_behind
+
+
+MOST_MISSED_K = 25
+CHUNK_SIZE = 1000
+
+# Fact record layout in analytics.json: [seen, correct, streak, timed, total_ms]
+SEEN, CORRECT, STREAK, TIMED, TOTAL_MS = range(5)
+# Mode record layout, per learner: [attempts, seen, correct, streak, best_streak, timed, total_ms]
+M_ATTEMPTS, M_SEEN, M_CORRECT, M_STREAK, M_BEST_STREAK, M_TIMED, M_TOTAL_MS = range(7)
+
+_OPS_BY_SYMBOL = {symbol: op for op, symbol in SYMBOLS.items()}
+
+
+def _empty() -> Dict[str, Any]:
+	return {"cursor": 0, "backend": None, "facts": {}, "modes": {}}
+
+
+def _answered(stored: Union[str, List[Dict[str, Any]], None]) -> Iterator[Tuple[Question, int, Optional[int]]]:
+	"""(question, learner's answer, ms or None) for a stored question log of either format."""
+	if isinstance(stored, str):
+		yield from QuestionLog.decode(stored).timed_rows()
+		return
+	for item in stored or []:
+		# Dict logs from before the packed format only keep the problem text
+		try:
+			a, symbol, b = item["problem"].split()[:3]
+			yield make_question(_OPS_BY_SYMBOL[symbol], int(a), int(b)), int(item["user"]), None
+		except (KeyError, TypeError, ValueError):
+			continue
+
+
+class FactAnalytics:
+	"""Accuracy, streaks, response times and most-missed facts, kept up to date incrementally.
+
+	The counters sit next to a cursor into the score store (`read_attempts_after`), so
+	each update only reads attempts recorded since the last one. Most-missed facts
+	are kept in a Leaderboard per operation: misses only go up, so each update is O(K)
+	and the view never sorts the whole table.
+	"""
+
+	def __init__(self, service=None, path: Optional[Path] = None, writer: Optional[WriteBehindQueue] = None) -> None:
+		self.service = service or get_high_score_service()
+		self.path = path or get_analytics_path()
+		self._writer = writer or get_write_behind()
+		data = read_json(self.path)
+		self._data: Dict[str, Any] = data if isinstance(data, dict) and "facts" in data else _empty()
+		self._backend = type(self.service).__name__
+		self._dirty = False
+		# Held while the counters change or are encoded for saving, which happen off the UI thread
+		self._lock = threading.RLock()
+		if self._data.get("backend") != self._backend:
+			# The cursor belongs to another store; count everything again from its start
+			self._data = _empty()
+			self._data["backend"] = self._backend
+			self._dirty = True
+		self._missed: Dict[str, Leaderboard] = {}
+		for key, rec in self._data["facts"].items():
+			self._offer_missed(key, rec)
+
+	def _offer_missed(self, key: str, rec: List[int]) -> None:
+		misses = rec[SEEN] - rec[CORRECT]
+		if misses <= 0:
+			return
+		entry = HighScore(key, misses, rec[SEEN])
+		self._leaderboard("mix").offer(entry)
+		self._leaderboard(key.split(":", 1)[0]).offer(entry)
+
+	def _leaderboard(self, mode: str) -> Leaderboard:
+		board = self._missed.get(mode)
+		if board is None:
+			board = self._missed[mode] = Leaderboard(MOST_MISSED_K)
+		return board
+
+	def observe(self, attempt: Dict[str, Any]) -> None:
+		"""Fold one recorded attempt into the counters."""
+		facts = self._data["facts"]
+		profile_modes = self._data["modes"].setdefault(attempt.get("profile", DEFAULT_PROFILE), {})
+		mode_rec = profile_modes.setdefault(attempt["mode"], [0] * 7)
+		mode_rec[M_ATTEMPTS] += 1
+		for question, user, ms in _answered(attempt.get("questions")):
+			key = fact_key(question)
+			rec = facts.setdefault(key, [0] * 5)
+			correct = user == question.answer
+			rec[SEEN] += 1
+			mode_rec[M_SEEN] += 1
+			if correct:
+				rec[CORRECT] += 1
+				rec[STREAK] += 1
+				mode_rec[M_CORRECT] += 1
+				mode_rec[M_STREAK] += 1
+				mode_rec[M_BEST_STREAK] = max(mode_rec[M_BEST_STREAK], mode_rec[M_STREAK])
+			else:
+				rec[STREAK] = 0
+				mode_rec[M_STREAK] = 0
+				self._offer_missed(key, rec)
+			if ms is not None:
+				rec[TIMED] += 1
+				rec[TOTAL_MS] += ms
+				mode_rec[M_TIMED] += 1
+				mode_rec[M_TOTAL_MS] += ms
+		self._dirty = True
+
+	def catch_up(self, chunk_size: int = CHUNK_SIZE) -> int:
+		"""Fold every attempt recorded since the last call, in chunks. Returns how many."""
+		folded = 0
+		while True:
+			attempts, cursor = self.service.read_attempts_after(self._data["cursor"], chunk_size)
+			with self._lock:
+				for attempt in attempts:
+					self.observe(attempt)
+				if cursor != self._data["cursor"]:
+					self._data["cursor"] = cursor
+					self._dirty = True
+			folded += len(attempts)
+			if len(attempts) < chunk_size:
+				break
+		self.save()
+		return folded
+
+	def catch_up_later(self, on_done: Optional[Callable[[], None]] = None) -> None:
+		"""catch_up on the write-behind thread; `on_done` then runs on the main thread."""
+		self._writer.submit(f"analytics-fold:{self.path}", self.catch_up, on_done)
+
+	def rebuild(self, chunk_size: int = CHUNK_SIZE) -> int:
+		"""Throw the counters away and stream the whole history through them again."""
+		with self._lock:
+			self._data = _empty()
+			self._data["backend"] = self._backend
+			self._missed = {}
+		return self.catch_up(chunk_size)
+
+	def save(self) -> None:
+		"""Write behind; the table is encoded on the writer thread, not here."""
+		if self._dirty:
+			self._writer.submit(f"analytics:{self.path}", self._write)
+			self._dirty = False
+
+	def _write(self) -> None:
+		with self._lock:
+			payload = dumps_chunked(self._data)
+		write_bytes_atomic(self.path, payload)
+
+	def fact_stats(self, key: str) -> Dict[str, Any]:
+		with self._lock:
+			rec = list(self._data["facts"].get(key, [0] * 5))
+		question = question_from_key(key)
+		return {
+			"fact": key,
+			"problem": question.problem,
+			"seen": rec[SEEN],
+			"missed": rec[SEEN] - rec[CORRECT],
+			"accuracy": rec[CORRECT] / rec[SEEN] if rec[SEEN] else None,
+			"streak": rec[STREAK],
+			"avg_ms": rec[TOTAL_MS] / rec[TIMED] if rec[TIMED] else None,
+		}
+
+	def most_missed(self, mode: str = "mix", n: int = 10) -> List[Dict[str, Any]]:
+		"""The class's most-missed facts for a base mode (or all of them for "mix")."""
+		with self._lock:
+			board = self._missed.get(mode)
+			return [self.fact_stats(entry.name) for entry in board.top(n)] if board else []
+
+	def mode_stats(self, mode: str, profile: str = DEFAULT_PROFILE) -> Dict[str, Any]:
+		with self._lock:
+			rec = list(self._data["modes"].get(profile, {}).get(mode, [0] * 7))
+		return {
+			"attempts": rec[M_ATTEMPTS],
+			"seen": rec[M_SEEN],
+			"accuracy": rec[M_CORRECT] / rec[M_SEEN] if rec[M_SEEN] else None,
+			"streak": rec[M_STREAK],
+			"best_streak": rec[M_BEST_STREAK],
+			"avg_ms": rec[M_TOTAL_MS] / rec[M_TIMED] if rec[M_TIMED] else None,
+		}
+
+
+_analytics: Optional[FactAnalytics] = None
+
+
+def get_fact_analytics() -> FactAnalytics:
+	global _analytics
+	if _analytics is None:
+		_analytics = FactAnalytics()
+	return _analytics
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+	parser = argparse.ArgumentParser(description="Per-fact analytics over the recorded attempts.")
+	sub = parser.add_subparsers(dest="command", required=True)
+	rebuild = sub.add_parser("rebuild", help="recount everything from the attempt history")
+	rebuild.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+	missed = sub.add_parser("most-missed", help="print the most-missed facts")
+	missed.add_argument("mode", nargs="?", default="mix", choices=[*BASE_MODES, "mix"])
+	missed.add_argument("n", nargs="?", type=int, default=10)
+	args = parser.parse_args(argv)
+
+	analytics = get_fact_analytics()
+	if args.command == "rebuild":
+		print(f"Folded {analytics.rebuild(args.chunk_size)} attempts into {analytics.path}")
+	else:
+		analytics.catch_up()
+		for stats in analytics.most_missed(args.mode, args.n):
+			avg = f", {stats['avg_ms'] / 1000:.1f}s avg" if stats["avg_ms"] is not None else ""
+			print(f"{stats['problem'][:-4]:<12} missed {stats['missed']}/{stats['seen']}{avg}")
+	flush_pending_writes()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+from typing import Callable, List
+import threading
+from .write_behind import Callback, clock_dispatch
+
+
+class ChangeNotifier:
+	"""Tells subscribers that a store's data changed, on the main thread.
+
+	Several notifications before the listeners have run collapse into one call, so a
+	burst of writes (or a bulk import) costs a single UI update.
+	"""
+
+	def __init__(self, dispatch: Callable[[Callback], None] = clock_dispatch) -> None:
+		self._dispatch = dispatch
+		self._listeners: List[Callback] = []
+		self._lock = threading.Lock()
+		self._scheduled = False
+
+	def subscribe(self, callback: Callback) -> None:
+		if callback not in self._listeners:
+			self._listeners.append(callback)
+
+	def unsubscribe(self, callback: Callback) -> None:
+		if callback in self._listeners:
+			self._listeners.remove(callback)
+
+	def notify(self) -> None:
+		with self._lock:
+			if self._scheduled or not self._listeners:
+				return
+			self._scheduled = True
+		self._dispatch(self._deliver)
+
+	def _deliver(self) -> None:
+		with self._lock:
+			self._scheduled = False
+		for callback in list(self._listeners):
+			callback()
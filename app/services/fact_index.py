@@ -0,0 +1,143 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+from .question_bank import BASE_MODES, QUESTION_TABLES, Question
+
+
+# Skill tags. Each fact carries a bitmask of these; `row<n>` tags are generated below.
+CARRY = 1 << 0
+BORROW = 1 << 1
+SAME_DIGIT = 1 << 2
+SINGLE_DIGIT = 1 << 3
+TWO_DIGIT = 1 << 4
+_ROW_SHIFT = 8
+
+TAGS: Dict[str, int] = {
+	"carry": CARRY,
+	"borrow": BORROW,
+	"same_digit": SAME_DIGIT,
+	"single_digit": SINGLE_DIGIT,
+	"two_digit": TWO_DIGIT,
+}
+TAGS.update({f"row{n}": 1 << (_ROW_SHIFT + n) for n in range(1, 10)})
+
+# Ready-made targeted drills; any "<mode>:<tag>,no_<tag>" string works as a mode too.
+DRILL_MODES: Dict[str, str] = {
+	"addition_no_carry": "addition:two_digit,no_carry",
+	"addition_carry": "addition:carry",
+	"subtraction_no_borrow": "subtraction:two_digit,no_borrow",
+	"subtraction_borrow": "subtraction:borrow",
+	"doubles": "addition:same_digit",
+}
+
+
+def mode_title(mode: str) -> str:
+	"""Display name for a quiz or drill mode ("addition_no_carry" -> "Addition No Carry")."""
+	return mode.replace("_", " ").title()
+
+
+def _needs_carry(a: int, b: int) -> bool:
+	while a or b:
+		if a % 10 + b % 10 >= 10:
+			return True
+		a, b = a // 10, b // 10
+	return False
+
+
+def _needs_borrow(a: int, b: int) -> bool:
+	while b:
+		if a % 10 < b % 10:
+			return True
+		a, b = a // 10, b // 10
+	return False
+
+
+def fact_tags(q: Question) -> int:
+	"""Skill bitmask for a single fact."""
+	tags = 0
+	if q.a == q.b:
+		tags |= SAME_DIGIT
+	if q.a < 10 and q.b < 10:
+		tags |= SINGLE_DIGIT
+	if q.a >= 10 and q.b >= 10:
+		tags |= TWO_DIGIT
+	if q.op == "addition" and _needs_carry(q.a, q.b):
+		tags |= CARRY
+	elif q.op == "subtraction" and _needs_borrow(q.a, q.b):
+		tags |= BORROW
+	elif q.op == "multiplication":
+		tags |= TAGS[f"row{q.a}"] | TAGS[f"row{q.b}"]
+	elif q.op == "division":
+		tags |= TAGS[f"row{q.b}"]
+	return tags
+
+
+def parse_mode(mode: str) -> Tuple[str, int, int]:
+	"""Split a mode string into (base mode, required tags, excluded tags)."""
+	mode = DRILL_MODES.get(mode, mode)
+	base, _, spec = mode.partition(":")
+	if base not in BASE_MODES:
+		raise ValueError("Unknown mode")
+	include = exclude = 0
+	for name in filter(None, (part.strip() for part in spec.split(","))):
+		negate = name.startswith("no_")
+		bit = TAGS.get(name[3:] if negate else name)
+		if bit is None:
+			raise ValueError(f"Unknown skill tag '{name}'")
+		if negate:
+			exclude |= bit
+		else:
+			include |= bit
+	return base, include, exclude
+
+
+class FactIndex:
+	"""Every distinct fact per base mode, with one bitset of fact positions per skill tag."""
+
+	def __init__(self) -> None:
+		self.facts: Dict[str, List[Question]] = {}
+		self._bitsets: Dict[str, Dict[int, int]] = {}
+		self._selections: Dict[Tuple[str, int, int], Sequence[Question]] = {}
+		for op in BASE_MODES:
+			facts = list(dict.fromkeys(QUESTION_TABLES[op]))
+			bitsets = {bit: 0 for bit in TAGS.values()}
+			for pos, q in enumerate(facts):
+				tags = fact_tags(q)
+				for bit in bitsets:
+					if tags & bit:
+						bitsets[bit] |= 1 << pos
+			self.facts[op] = facts
+			self._bitsets[op] = bitsets
+
+	def _mask(self, op: str, include: int, exclude: int) -> int:
+		bitsets = self._bitsets[op]
+		mask = (1 << len(self.facts[op])) - 1
+		for bit, members in bitsets.items():
+			if include & bit:
+				mask &= members
+			elif exclude & bit:
+				mask &= ~members
+		return mask
+
+	def select(self, mode: str) -> Sequence[Question]:
+		"""Facts matching a mode string; computed once per tag combination."""
+		key = parse_mode(mode)
+		selection = self._selections.get(key)
+		if selection is None:
+			op, include, exclude = key
+			mask = self._mask(op, include, exclude)
+			facts = self.facts[op]
+			selection = tuple(facts[pos] for pos in range(len(facts)) if mask >> pos & 1)
+			if not selection:
+				raise ValueError(f"No facts match mode '{mode}'")
+			self._selections[key] = selection
+		return selection
+
+
+_index: Optional[FactIndex] = None
+
+
+def get_fact_index() -> FactIndex:
+	global _index
+	if _index is None:
+		_index = FactIndex()
+	return _index
@@ -1,65 +1,329 @@
 from __future__ import annotations
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
 from datetime import datetime
+from pathlib import Path
+import json
+import os
+import threading
+import uuid
 from ..config.paths import get_high_scores_path
-from ..utils.json_store import read_json, write_json
+from ..utils.file_lock import FileLock
+from ..utils.id_set import DiskIdSet
+from ..utils.json_store import append_bytes, read_json, write_json
+from ..models.high_score import HighScore
+from .events import ChangeNotifier
+from .leaderboard import DEFAULT_TOP_K, Leaderboard
+from .log_codec import QuestionLog, encode_questions
+from .schema import DEFAULT_MODES, DEFAULT_PROFILE, load_snapshot
+from .transfer import chunked
+from .write_behind import WriteBehindQueue, get_write_behind
 
 
-DEFAULT_MODES = ["addition", "subtraction", "multiplication", "division", "mix"]
+# Fold the journal into the snapshot once this many bytes are past the last compaction
+COMPACT_THRESHOLD = 256 * 1024
 
 
 class HighScoreService:
-	def __init__(self) -> None:
-		self.path = get_high_scores_path()
-		data = read_json(self.path)
-		if not isinstance(data, dict):
-			data = {"modes": {m: {"best": None} for m in DEFAULT_MODES}}
-		else:
-			# migrate: remove attempts, keep only best
-			for m in DEFAULT_MODES:
-				mode_obj = data.get("modes", {}).get(m)
-				if mode_obj:
-					if "attempts" in mode_obj:
-						del mode_obj["attempts"]
-					if isinstance(mode_obj.get("best"), dict) and "questions" not in mode_obj["best"]:
-						mode_obj["best"]["questions"] = []
-		write_json(self.path, data)
+	"""Per-mode best scores backed by an append-only attempt journal.
+
+	Every finished quiz is appended as one JSON line to attempts.jsonl (off the UI
+	thread, through the write-behind queue). The snapshot (highscores.json) holds the
+	bests folded from the journal up to `journal_offset`; anything after that offset
+	is replayed on load. Bests are kept class-wide per mode ("modes") and per learner
+	("profiles"); the per-learner bests also feed a top-K leaderboard per mode.
+	"""
+
+	def __init__(self, path: Optional[Path] = None, writer: Optional[WriteBehindQueue] = None) -> None:
+		self.path = path or get_high_scores_path()
+		self.journal_path = self.path.with_name("attempts.jsonl")
+		# Serializes journal appends and compaction with other app instances
+		self._file_lock = FileLock(self.path.with_name("highscores.lock"))
+		self._writer = writer or get_write_behind()
+		self._lock = threading.Lock()
+		self._pending_records: List[Dict[str, Any]] = []
+		self.changes = ChangeNotifier()
+		with self._file_lock:
+			data = load_snapshot(self.path)
+		self._snapshot_sig = _signature(self.path)
+		self._load(data)
+
+	def _load(self, data: Dict[str, Any]) -> None:
 		self._cache = data
+		self._cache.setdefault("modes", {})
+		profiles = self._cache.setdefault("profiles", {})
+		self._leaderboards: Dict[str, Leaderboard] = {}
+		for profile, bests in profiles.items():
+			for mode, best in bests.items():
+				self._leaderboard(mode).offer(_entry(profile, best))
+		self._journal_size = int(data.get("journal_offset", 0))
+		self._replay_journal()
+		for record in self._pending_records:
+			self._fold(record)
+
+	def _leaderboard(self, mode: str) -> Leaderboard:
+		board = self._leaderboards.get(mode)
+		if board is None:
+			board = self._leaderboards[mode] = Leaderboard()
+		return board
 
-	def _save(self) -> None:
-		write_json(self.path, self._cache)
+	def _replay_journal(self) -> None:
+		self._journal_sig = _signature(self.journal_path)
+		for record in self._read_journal(self._journal_size):
+			self._fold(record)
 
-	def record_attempt(self, mode: str, score: int, total: int, questions: List[Dict[str, Any]]) -> bool:
-		"""Record a quiz attempt. Returns True if it's a new high score, False otherwise."""
-		if mode not in self._cache["modes"]:
-			self._cache["modes"][mode] = {"best": None}
-		best = self._cache["modes"][mode]["best"]
-		# Only save if it's a new high score
-		is_new_high_score = best is None or score > best.get("score", 0)
+	def _read_journal(self, offset: int = 0) -> Iterator[Dict[str, Any]]:
+		"""Yield complete journal records from `offset`, advancing _journal_size as it goes."""
+		try:
+			f = self.journal_path.open("rb")
+		except FileNotFoundError:
+			return
+		with f:
+			f.seek(offset)
+			for line in f:
+				if not line.endswith(b"\n"):
+					break  # a write still in progress; picked up on the next refresh
+				offset += len(line)
+				self._journal_size = offset
+				try:
+					yield json.loads(line)
+				except ValueError:
+					continue
+
+	def _fold(self, record: Dict[str, Any]) -> bool:
+		"""Apply one attempt to the in-memory bests. Returns True if it's the learner's new best."""
+		mode = record["mode"]
+		profile = record.get("profile") or DEFAULT_PROFILE
+		best = {
+			"score": record["score"],
+			"total": record["total"],
+			"timestamp": record["timestamp"],
+			"questions": record["questions"],
+		}
+		mode_obj = self._cache["modes"].setdefault(mode, {"best": None})
+		class_best = mode_obj.get("best")
+		if class_best is None or best["score"] > class_best.get("score", 0):
+			mode_obj["best"] = best
+		if not self._leaderboard(mode).offer(_entry(profile, best)):
+			return False
+		self._cache["profiles"].setdefault(profile, {})[mode] = best
+		return True
+
+	def record_attempt(self, mode: str, score: int, total: int, questions: Union[QuestionLog, List[Dict[str, Any]]], on_saved: Optional[Callable[[], None]] = None, profile: str = DEFAULT_PROFILE) -> bool:
+		"""Record a quiz attempt. Returns True if it's the learner's new high score, False otherwise.
+
+		The result is decided in memory; the journal append happens on the write-behind
+		thread and `on_saved` is called on the main thread once it is on disk.
+		"""
+		record = {
+			"id": uuid.uuid4().hex,
+			"profile": profile,
+			"mode": mode,
+			"score": int(score),
+			"total": int(total),
+			"timestamp": datetime.now().isoformat(),
+			"questions": encode_questions(questions),
+		}
+		with self._lock:
+			self._pending_records.append(record)
+			is_new_high_score = self._fold(record)
+		self._writer.submit(f"journal:{self.journal_path}", self._write_journal, on_saved)
 		if is_new_high_score:
-			self._cache["modes"][mode]["best"] = {
-				"score": int(score),
-				"total": int(total),
-				"timestamp": datetime.now().isoformat(),
-				"questions": questions,
-			}
-			self._save()
+			self.changes.notify()
 		return is_new_high_score
 
-	def get_best(self, mode: str) -> Dict | None:
+	def _write_journal(self) -> None:
+		with self._lock:
+			records, self._pending_records = self._pending_records, []
+		if not records:
+			return
+		payload = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+		try:
+			with self._file_lock:
+				end = append_bytes(self.journal_path, payload, new_line=True)
+		except BaseException:
+			# Keep them (ahead of anything queued since) for the queue's retry
+			with self._lock:
+				self._pending_records[:0] = records
+			raise
+		# A torn line left by a crash is closed off first, so `start` can be past what we'd read
+		start = end - len(payload)
+		with self._lock:
+			merged = start != self._journal_size
+			if merged:
+				# Another app instance appended since we last read the journal (or a
+				# refresh already read our lines): merge whatever we haven't seen
+				self._replay_journal()
+			else:
+				self._journal_size = end
+				self._journal_sig = _signature(self.journal_path)
+			# The cache may have been reloaded from disk while these were queued
+			for record in records:
+				self._fold(record)
+			backlog = self._journal_size - int(self._cache.get("journal_offset", 0))
+		if merged:
+			self.changes.notify()
+		if backlog >= COMPACT_THRESHOLD:
+			self._writer.submit(f"snapshot:{self.path}", self.compact)
+
+	def compact(self) -> None:
+		"""Write the folded bests as the new snapshot so the journal needn't be replayed.
+
+		Runs under the data directory lock after catching up with whatever other app
+		instances wrote, so their results are merged rather than overwritten. Bests may
+		already include records still waiting for the journal; replaying those again
+		later is harmless because folding a record twice changes nothing.
+		"""
+		with self._file_lock:
+			self.refresh()
+			with self._lock:
+				snapshot = {
+					**self._cache,
+					"modes": {m: dict(obj) for m, obj in self._cache["modes"].items()},
+					"profiles": {p: dict(bests) for p, bests in self._cache["profiles"].items()},
+					"journal_offset": self._journal_size,
+				}
+			write_json(self.path, snapshot)
+			with self._lock:
+				self._cache["journal_offset"] = snapshot["journal_offset"]
+				self._snapshot_sig = _signature(self.path)
+
+	def flush(self, timeout: Optional[float] = None) -> bool:
+		"""Wait for queued writes to reach the disk."""
+		return self._writer.flush(timeout)
+
+	def get_best(self, mode: str, profile: Optional[str] = None) -> Dict | None:
+		"""Best attempt for a mode: the learner's own if `profile` is given, else the class best."""
 		self.refresh()  # Always get fresh data
+		if profile is not None:
+			return self._cache["profiles"].get(profile, {}).get(mode)
 		return (self._cache.get("modes", {}).get(mode) or {}).get("best")
 
+	def get_leaderboard(self, mode: str, k: int = DEFAULT_TOP_K) -> List[HighScore]:
+		"""Top learners for a mode by personal best, highest first."""
+		self.refresh()
+		with self._lock:
+			return self._leaderboard(mode).top(k)
+
+	def get_profiles(self) -> List[str]:
+		self.refresh()
+		return list(self._cache["profiles"])
+
 	def get_attempts(self, mode: str) -> List[Dict]:
-		# Keep method for compatibility, but return empty list since we only store best
-		return []
+		"""Full attempt history for a mode, oldest first, read from the journal."""
+		return [record for record in self.iter_attempts() if record.get("mode") == mode]
+
+	def iter_attempts(self) -> Iterator[Dict[str, Any]]:
+		try:
+			f = self.journal_path.open("rb")
+		except FileNotFoundError:
+			return
+		with f:
+			for line in f:
+				try:
+					yield json.loads(line)
+				except ValueError:
+					continue
+
+	def read_attempts_after(self, cursor: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+		"""Up to `limit` attempts written after `cursor` (a journal byte offset), and the next cursor."""
+		records: List[Dict[str, Any]] = []
+		try:
+			f = self.journal_path.open("rb")
+		except FileNotFoundError:
+			return records, cursor
+		with f:
+			f.seek(cursor)
+			for line in f:
+				if not line.endswith(b"\n") or len(records) >= limit:
+					break
+				cursor += len(line)
+				try:
+					records.append(json.loads(line))
+				except ValueError:
+					continue
+		return records, cursor
+
+	def import_attempts(self, records: Iterable[Dict[str, Any]], chunk_size: int = 1000) -> int:
+		"""Append attempts exported from other devices, skipping ids already in the journal.
+
+		Streams: records are appended a chunk at a time and the known ids are kept on
+		disk, so memory stays flat for any number of rows. Returns how many were new.
+		"""
+		self.flush()
+		added = 0
+		with DiskIdSet() as seen:
+			for record in self.iter_attempts():
+				if "id" in record:
+					seen.add(record["id"])
+			for chunk in chunked(records, chunk_size):
+				fresh = [r for r in chunk if seen.add(r["id"])]
+				if not fresh:
+					continue
+				payload = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in fresh).encode("utf-8")
+				with self._file_lock:
+					append_bytes(self.journal_path, payload, new_line=True)
+				added += len(fresh)
+		# Fold the new lines exactly like another instance's appends
+		self.refresh()
+		if self._journal_size - int(self._cache.get("journal_offset", 0)) >= COMPACT_THRESHOLD:
+			self.compact()
+		return added
 
 	def refresh(self) -> None:
-		"""Reload data from disk to get latest scores."""
-		data = read_json(self.path)
-		if isinstance(data, dict):
-			self._cache = data
+		"""Pick up changes made by other instances; a no-op unless a file's mtime or size changed."""
+		changed = False
+		with self._lock:
+			snapshot_sig = _signature(self.path)
+			if snapshot_sig != self._snapshot_sig:
+				data = read_json(self.path)
+				if isinstance(data, dict):
+					self._snapshot_sig = snapshot_sig
+					self._load(data)
+					changed = True
+			elif _signature(self.journal_path) != self._journal_sig:
+				self._replay_journal()
+				changed = True
+		if changed:
+			self.changes.notify()
+
+	def subscribe(self, callback: Callable[[], None]) -> None:
+		"""Call `callback` on the main thread whenever bests may have changed."""
+		self.changes.subscribe(callback)
+
+	def unsubscribe(self, callback: Callable[[], None]) -> None:
+		self.changes.unsubscribe(callback)
 
 	def get_overview(self) -> Dict[str, Dict]:
 		self.refresh()  # Always get fresh data
 		return self._cache.get("modes", {})
+
+
+def _entry(profile: str, best: Dict[str, Any]) -> HighScore:
+	return HighScore(profile, int(best.get("score", 0)), int(best.get("total", 0)), best.get("timestamp") or "")
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+	try:
+		st = path.stat()
+	except OSError:
+		return None
+	return st.st_mtime_ns, st.st_size
+
+
+def create_high_score_service():
+	"""Build the score store selected by LEARNBRIGHT_SCORE_BACKEND ("json" or "sqlite")."""
+	if os.environ.get("LEARNBRIGHT_SCORE_BACKEND", "json").lower() == "sqlite":
+		from .sqlite_score_service import SQLiteHighScoreService
+		return SQLiteHighScoreService()
+	return HighScoreService()
+
+
+_shared_service = None
+
+
+def get_high_score_service():
+	"""The process-wide score service; screens share it instead of building their own."""
+	global _shared_service
+	if _shared_service is None:
+		_shared_service = create_high_score_service()
+	return _shared_service
@@ -0,0 +1,47 @@
+from __future__ import annotations
+from bisect import insort
+from typing import Dict, List, Tuple
+from ..models.high_score import HighScore
+
+
+DEFAULT_TOP_K = 10
+
+
+def _rank_key(entry: HighScore) -> Tuple[int, str]:
+	# Higher score first; on a tie whoever got there first
+	return -entry.score, entry.timestamp
+
+
+class Leaderboard:
+	"""Top-K learners of one mode, by each learner's best score.
+
+	Bests only ever go up, so a learner who falls out of the top K can only come
+	back by improving, which is offered here too. Each update is O(K).
+	"""
+
+	def __init__(self, k: int = DEFAULT_TOP_K) -> None:
+		self.k = k
+		self._best: Dict[str, HighScore] = {}
+		self._top: List[Tuple[Tuple[int, str], str]] = []
+
+	def offer(self, entry: HighScore) -> bool:
+		"""Consider a learner's result. Returns True if it is their new best."""
+		current = self._best.get(entry.name)
+		if current is not None and entry.score <= current.score:
+			return False
+		self._best[entry.name] = entry
+		if current is not None:
+			old = (_rank_key(current), entry.name)
+			if old in self._top:
+				self._top.remove(old)
+		item = (_rank_key(entry), entry.name)
+		if len(self._top) < self.k or item < self._top[-1]:
+			insort(self._top, item)
+			del self._top[self.k:]
+		return True
+
+	def top(self, n: int = DEFAULT_TOP_K) -> List[HighScore]:
+		return [self._best[name] for _key, name in self._top[:n]]
+
+	def best(self, name: str) -> HighScore | None:
+		return self._best.get(name)
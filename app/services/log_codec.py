@@ -0,0 +1,96 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union, overload
+import base64
+import struct
+from .question_bank import BASE_MODES, Question, make_question
+
+
+# One answered question: operator code, two operands, the learner's answer, response time in ms
+ROW = struct.Struct("<BHHiH")
+# Logs written before response times were kept have no ms field and no header
+ROW_V1 = struct.Struct("<BHHi")
+# Marks an encoded log as using ROW; no operator code can be 0xFF
+V2_HEADER = b"\xff"
+NO_TIME = 0xFFFF
+OP_CODES = {op: code for code, op in enumerate(BASE_MODES)}
+_INT32 = (-2 ** 31, 2 ** 31 - 1)
+
+
+class QuestionLog(Sequence):
+	"""Per-question log packed as fixed-width rows; rows are decoded only when read.
+
+	Indexing yields the same dicts the log used to store ("problem", "answer", "user",
+	"correct", plus "ms"), built on demand, so display code is unchanged.
+	"""
+
+	def __init__(self, data: Union[bytes, bytearray] = b"", row: struct.Struct = ROW) -> None:
+		self._data = bytearray(data)
+		self._row = row
+
+	def append(self, question: Question, user: int, ms: Optional[int] = None) -> None:
+		user = min(max(int(user), _INT32[0]), _INT32[1])
+		if self._row is ROW_V1:
+			self._data += ROW_V1.pack(OP_CODES[question.op], question.a, question.b, user)
+			return
+		ms = NO_TIME if ms is None else min(max(int(ms), 0), NO_TIME - 1)
+		self._data += ROW.pack(OP_CODES[question.op], question.a, question.b, user, ms)
+
+	def __len__(self) -> int:
+		return len(self._data) // self._row.size
+
+	def _unpack(self, fields: tuple) -> Tuple[Question, int, Optional[int]]:
+		ms = fields[4] if len(fields) > 4 and fields[4] != NO_TIME else None
+		return make_question(BASE_MODES[fields[0]], fields[1], fields[2]), fields[3], ms
+
+	def timed_row(self, index: int) -> Tuple[Question, int, Optional[int]]:
+		"""(question, learner's answer, response ms or None if it wasn't recorded)."""
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError("question log index out of range")
+		return self._unpack(self._row.unpack_from(self._data, index * self._row.size))
+
+	def row(self, index: int) -> Tuple[Question, int]:
+		return self.timed_row(index)[:2]
+
+	def timed_rows(self) -> Iterator[Tuple[Question, int, Optional[int]]]:
+		for fields in self._row.iter_unpack(bytes(self._data)):
+			yield self._unpack(fields)
+
+	def rows(self) -> Iterator[Tuple[Question, int]]:
+		for question, user, _ms in self.timed_rows():
+			yield question, user
+
+	@overload
+	def __getitem__(self, index: int) -> Dict[str, Any]: ...
+	@overload
+	def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(len(self)))]
+		question, user, ms = self.timed_row(index)
+		return {"problem": question.problem, "answer": question.answer, "user": user, "correct": user == question.answer, "ms": ms}
+
+	def encode(self) -> str:
+		header = V2_HEADER if self._row is ROW else b""
+		return base64.b64encode(header + bytes(self._data)).decode("ascii")
+
+	@classmethod
+	def decode(cls, text: str) -> "QuestionLog":
+		raw = base64.b64decode(text)
+		if raw[:1] == V2_HEADER:
+			return cls(raw[1:])
+		return cls(raw, ROW_V1)
+
+
+def encode_questions(questions: Union[QuestionLog, List[Dict[str, Any]]]) -> Union[str, List[Dict[str, Any]]]:
+	"""JSON-ready form of a question log; plain dict lists are stored as they are."""
+	return questions.encode() if isinstance(questions, QuestionLog) else questions
+
+
+def decode_questions(stored: Union[str, List[Dict[str, Any]], None]) -> Sequence[Dict[str, Any]]:
+	"""Read a stored question log: packed rows, or the dict list older files contain."""
+	if isinstance(stored, str):
+		return QuestionLog.decode(stored)
+	return stored or []
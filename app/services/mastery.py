@@ -0,0 +1,137 @@
+from __future__ import annotations
+from heapq import heapify, heappop, heappush
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from ..config.paths import get_mastery_path
+from ..utils.json_store import dumps_chunked, read_json, write_bytes_atomic
+from .fact_index import fact_tags, parse_mode
+from .high_score_service import DEFAULT_PROFILE
+from .question_bank import BASE_MODES, Question, make_question
+from .write_behind import WriteBehindQueue, get_write_behind
+
+
+# Leitner boxes: how many answered questions until a fact in box N is asked again.
+# A fact that reaches MASTERED_BOX leaves the schedule.
+BOX_INTERVALS = (3, 8, 20, 50)
+MASTERED_BOX = len(BOX_INTERVALS)
+
+# Fact record layout in mastery.json: [box, due_tick, seen, correct]
+BOX, DUE, SEEN, CORRECT = range(4)
+
+
+def fact_key(q: Question) -> str:
+	return f"{q.op}:{q.a}:{q.b}"
+
+
+def question_from_key(key: str) -> Question:
+	op, a, b = key.split(":")
+	return make_question(op, int(a), int(b))
+
+
+def _mode_filter(mode: str) -> Callable[[Question], bool]:
+	if mode == "mix":
+		return lambda q: q.op in BASE_MODES
+	op, include, exclude = parse_mode(mode)
+	return lambda q: q.op == op and (fact_tags(q) & include) == include and not fact_tags(q) & exclude
+
+
+class MasteryScheduler:
+	"""Per-learner Leitner schedule over the facts a learner has missed.
+
+	Time is counted in answered questions ("ticks") per profile. Each (profile, mode)
+	pair gets a lazily built min-heap of (due_tick, fact_key); stale entries are
+	skipped on peek, so picking and rescheduling are both O(log n).
+	"""
+
+	def __init__(self, path: Optional[Path] = None, writer: Optional[WriteBehindQueue] = None) -> None:
+		self.path = path or get_mastery_path()
+		self._writer = writer or get_write_behind()
+		data = read_json(self.path)
+		self._profiles: Dict[str, Dict] = data.get("profiles", {}) if isinstance(data, dict) else {}
+		self._heaps: Dict[Tuple[str, str], List[Tuple[int, str]]] = {}
+		self._filters: Dict[str, Callable[[Question], bool]] = {}
+		self._dirty = False
+
+	def _profile(self, profile: str) -> Dict:
+		return self._profiles.setdefault(profile, {"tick": 0, "facts": {}})
+
+	def _filter(self, mode: str) -> Callable[[Question], bool]:
+		accepts = self._filters.get(mode)
+		if accepts is None:
+			accepts = self._filters[mode] = _mode_filter(mode)
+		return accepts
+
+	def _heap(self, profile: str, mode: str) -> List[Tuple[int, str]]:
+		heap = self._heaps.get((profile, mode))
+		if heap is None:
+			accepts = self._filter(mode)
+			facts = self._profile(profile)["facts"]
+			heap = [(rec[DUE], key) for key, rec in facts.items() if rec[BOX] < MASTERED_BOX and accepts(question_from_key(key))]
+			heapify(heap)
+			self._heaps[(profile, mode)] = heap
+		return heap
+
+	def next_due(self, mode: str, profile: str = DEFAULT_PROFILE) -> Optional[Question]:
+		"""The most overdue weak fact for this mode, or None if nothing is due yet."""
+		state = self._profile(profile)
+		facts = state["facts"]
+		heap = self._heap(profile, mode)
+		while heap:
+			due, key = heap[0]
+			rec = facts.get(key)
+			if rec is None or rec[DUE] != due or rec[BOX] >= MASTERED_BOX:
+				heappop(heap)  # superseded by a later reschedule
+				continue
+			return question_from_key(key) if due <= state["tick"] else None
+		return None
+
+	def record(self, question: Question, correct: bool, profile: str = DEFAULT_PROFILE) -> None:
+		state = self._profile(profile)
+		state["tick"] += 1
+		self._dirty = True
+		key = fact_key(question)
+		rec = state["facts"].get(key)
+		if rec is None:
+			if correct:
+				# Known on first sight: nothing to practise, so don't track it
+				return
+			rec = state["facts"][key] = [0, 0, 0, 0]
+		rec[SEEN] += 1
+		if correct:
+			rec[CORRECT] += 1
+			rec[BOX] = min(rec[BOX] + 1, MASTERED_BOX)
+		else:
+			rec[BOX] = 0
+		if rec[BOX] >= MASTERED_BOX:
+			return
+		rec[DUE] = state["tick"] + BOX_INTERVALS[rec[BOX]]
+		bloated = []
+		for heap_key, heap in self._heaps.items():
+			if heap_key[0] == profile and self._filter(heap_key[1])(question):
+				heappush(heap, (rec[DUE], key))
+				if len(heap) > 2 * len(state["facts"]) + 64:
+					bloated.append(heap_key)
+		for heap_key in bloated:
+			del self._heaps[heap_key]  # rebuilt without stale entries on next use
+
+	def save(self) -> None:
+		"""Write behind; only a shallow copy is taken here, the encoding happens on the writer thread.
+
+		The copy keeps keys from coming and going under the encoder while the UI thread
+		records answers. Fact records are fixed-length lists updated in place, so the
+		encoder at worst sees a slightly newer record, which the next save writes anyway.
+		"""
+		if self._dirty:
+			profiles = {name: {**state, "facts": dict(state["facts"])} for name, state in self._profiles.items()}
+			self._writer.submit(f"mastery:{self.path}", lambda: write_bytes_atomic(self.path, dumps_chunked({"profiles": profiles})))
+			self._dirty = False
+
+
+_scheduler: Optional[MasteryScheduler] = None
+
+
+def get_mastery_scheduler() -> MasteryScheduler:
+	global _scheduler
+	if _scheduler is None:
+		_scheduler = MasteryScheduler()
+	return _scheduler
@@ -0,0 +1,44 @@
+from __future__ import annotations
+from typing import Dict, List, Optional
+from ..config.paths import get_profiles_path
+from ..utils.json_store import read_json, write_json
+from .high_score_service import DEFAULT_PROFILE
+from .write_behind import get_write_behind
+
+
+_state: Optional[Dict] = None
+
+
+def _load() -> Dict:
+	global _state
+	if _state is None:
+		data = read_json(get_profiles_path())
+		if not isinstance(data, dict):
+			data = {}
+		data.setdefault("active", DEFAULT_PROFILE)
+		data.setdefault("profiles", [DEFAULT_PROFILE])
+		_state = data
+	return _state
+
+
+def get_active_profile() -> str:
+	"""The learner currently using the device."""
+	return _load()["active"]
+
+
+def set_active_profile(name: str) -> str:
+	state = _load()
+	name = " ".join(name.split()) or DEFAULT_PROFILE
+	if name == state["active"] and name in state["profiles"]:
+		return name
+	state["active"] = name
+	if name not in state["profiles"]:
+		state["profiles"].append(name)
+	path = get_profiles_path()
+	snapshot = {**state, "profiles": list(state["profiles"])}
+	get_write_behind().submit(f"profiles:{path}", lambda: write_json(path, snapshot))
+	return name
+
+
+def list_profiles() -> List[str]:
+	return list(_load()["profiles"])
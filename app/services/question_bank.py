@@ -0,0 +1,101 @@
+from __future__ import annotations
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import random
+
+try:
+	import numpy as np
+except ImportError:  # NumPy is optional; fall back to the stdlib sampler
+	np = None
+
+
+BASE_MODES = ["addition", "subtraction", "multiplication", "division"]
+SYMBOLS = {"addition": "+", "subtraction": "-", "multiplication": "×", "division": "÷"}
+DEFAULT_BATCH = 256
+
+
+class Question(NamedTuple):
+	op: str
+	a: int
+	b: int
+	answer: int
+
+	@property
+	def problem(self) -> str:
+		return f"{self.a} {SYMBOLS[self.op]} {self.b} = ?"
+
+
+def _ordered_pairs(lo: int, hi: int) -> List[Tuple[int, int]]:
+	return [(a, b) for a in range(lo, hi + 1) for b in range(lo, hi + 1)]
+
+
+def make_question(op: str, a: int, b: int) -> Question:
+	if op == "addition":
+		return Question(op, a, b, a + b)
+	if op == "subtraction":
+		if b > a:
+			a, b = b, a
+		return Question(op, a, b, a - b)
+	if op == "multiplication":
+		return Question(op, a, b, a * b)
+	if op == "division":
+		return Question(op, a, b, a // b)
+	raise ValueError("Unknown mode")
+
+
+# Operand tables are built once at import; every draw is an index into one of them.
+OPERAND_TABLES: Dict[str, List[Tuple[int, int]]] = {
+	"addition": _ordered_pairs(1, 99),
+	# Drawn uniformly and then swapped so the answer is never negative
+	"subtraction": _ordered_pairs(1, 99),
+	"multiplication": _ordered_pairs(1, 9),
+	"division": [(a, b) for a, b in _ordered_pairs(1, 9) if a % b == 0],
+}
+QUESTION_TABLES: Dict[str, List[Question]] = {
+	op: [make_question(op, a, b) for a, b in pairs] for op, pairs in OPERAND_TABLES.items()
+}
+
+
+def _sample_indices(rng: random.Random, sizes: Sequence[int], count: int) -> List[int]:
+	"""Draw `count` indices, the i-th one below sizes[i]."""
+	if np is not None:
+		gen = np.random.default_rng(rng.getrandbits(64))
+		return (gen.random(count) * np.asarray(sizes)).astype(np.int64).tolist()
+	rand = rng.random
+	return [int(rand() * size) for size in sizes]
+
+
+def generate_deck(mode: str, count: int, rng: Optional[random.Random] = None) -> List[Question]:
+	"""Generate `count` questions for a quiz mode in one batch."""
+	rng = rng or random.Random()
+	if mode == "mix":
+		tables = [QUESTION_TABLES[op] for op in rng.choices(BASE_MODES, k=count)]
+		picks = _sample_indices(rng, [len(t) for t in tables], count)
+		return [table[i] for table, i in zip(tables, picks)]
+	table = QUESTION_TABLES.get(mode)
+	if table is None:
+		# Targeted drills such as "addition:two_digit,no_carry" draw from the fact index
+		from .fact_index import get_fact_index
+		table = get_fact_index().select(mode)
+	return [table[i] for i in _sample_indices(rng, [len(table)] * count, count)]
+
+
+class QuestionBuffer:
+	"""Hands out questions one at a time from pre-generated decks."""
+
+	def __init__(self, mode: str, batch_size: int = DEFAULT_BATCH, seed: Optional[int] = None) -> None:
+		self.mode = mode
+		self.batch_size = batch_size
+		self._rng = random.Random(seed)
+		self._deck: Deque[Question] = deque()
+
+	def refill(self) -> None:
+		self._deck.extend(generate_deck(self.mode, self.batch_size, self._rng))
+
+	def next(self) -> Question:
+		if not self._deck:
+			self.refill()
+		return self._deck.popleft()
+
+	def __len__(self) -> int:
+		return len(self._deck)
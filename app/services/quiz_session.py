@@ -0,0 +1,74 @@
+from __future__ import annotations
+from typing import Callable, Optional
+import time
+from .analytics import FactAnalytics, get_fact_analytics
+from .high_score_service import HighScoreService, get_high_score_service
+from .log_codec import QuestionLog
+from .mastery import MasteryScheduler, get_mastery_scheduler
+from .profiles import get_active_profile
+from .question_bank import Question, QuestionBuffer
+
+
+class QuizSession:
+	"""Quiz state and rules without any widgets: generation, checking, scoring and logging."""
+
+	def __init__(self, mode: str, profile: Optional[str] = None, mastery: Optional[MasteryScheduler] = None, seed: Optional[int] = None, analytics: Optional[FactAnalytics] = None) -> None:
+		self.mode = mode
+		self.profile = profile or get_active_profile()
+		self.question_index = 0
+		self.correct = 0
+		self.current: Optional[Question] = None
+		self.checked = False
+		self.logs = QuestionLog()
+		self._questions = QuestionBuffer(mode, seed=seed)
+		self._mastery = mastery if mastery is not None else get_mastery_scheduler()
+		self._analytics = analytics
+		self._shown_at = 0.0
+
+	@property
+	def current_problem(self) -> str:
+		return self.current.problem if self.current else ""
+
+	@property
+	def current_answer(self) -> Optional[int]:
+		return self.current.answer if self.current else None
+
+	def next(self) -> Question:
+		# Weak facts that are due for review come first, fresh questions otherwise
+		self.current = self._mastery.next_due(self.mode, self.profile) or self._questions.next()
+		self.question_index += 1
+		self.checked = False
+		self._shown_at = time.perf_counter()
+		return self.current
+
+	def check(self, user: int) -> bool:
+		"""Score the answer to the current question. Each question is scored once."""
+		if self.current is None:
+			raise RuntimeError("No question to check; call next() first")
+		correct_now = user == self.current.answer
+		if self.checked:
+			return correct_now
+		if correct_now:
+			self.correct += 1
+		self.checked = True
+		self._mastery.record(self.current, correct_now, self.profile)
+		self.logs.append(self.current, user, int((time.perf_counter() - self._shown_at) * 1000))
+		return correct_now
+
+	def save_progress(self) -> None:
+		self._mastery.save()
+
+	def finish(self, service: Optional[HighScoreService] = None, on_saved: Optional[Callable[[], None]] = None) -> bool:
+		"""Record the attempt. Returns True if it's a new high score; saving happens in the background."""
+		service = service or get_high_score_service()
+		analytics = self._analytics if self._analytics is not None else get_fact_analytics()
+
+		def saved() -> None:
+			# The attempt is on disk now, so the analytics can read it back (off the UI thread)
+			analytics.catch_up_later()
+			if on_saved is not None:
+				on_saved()
+
+		is_new_high_score = service.record_attempt(self.mode, score=self.correct, total=self.question_index, questions=self.logs, on_saved=saved, profile=self.profile)
+		self.save_progress()
+		return is_new_high_score
@@ -0,0 +1,82 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Tuple
+from pathlib import Path
+import shutil
+from ..utils.json_store import read_json, write_json
+
+
+DEFAULT_MODES = ["addition", "subtraction", "multiplication", "division", "mix"]
+DEFAULT_PROFILE = "default"
+
+Migration = Callable[[Dict[str, Any]], Dict[str, Any]]
+# Ordered (version it produces, step) pairs; a file at version N runs every step above N
+MIGRATIONS: List[Tuple[int, Migration]] = []
+
+
+def migration(version: int) -> Callable[[Migration], Migration]:
+	def register(step: Migration) -> Migration:
+		if MIGRATIONS and MIGRATIONS[-1][0] >= version:
+			raise ValueError(f"migration {version} registered out of order")
+		MIGRATIONS.append((version, step))
+		return step
+	return register
+
+
+@migration(1)
+def _keep_only_best(data: Dict[str, Any]) -> Dict[str, Any]:
+	"""Drop the old per-mode attempt lists; every best gets a question log."""
+	for mode_obj in data.setdefault("modes", {}).values():
+		if not mode_obj:
+			continue
+		mode_obj.pop("attempts", None)
+		if isinstance(mode_obj.get("best"), dict):
+			mode_obj["best"].setdefault("questions", [])
+	return data
+
+
+@migration(2)
+def _add_journal_offset(data: Dict[str, Any]) -> Dict[str, Any]:
+	data.setdefault("journal_offset", 0)
+	return data
+
+
+@migration(3)
+def _add_profiles(data: Dict[str, Any]) -> Dict[str, Any]:
+	"""Scores from before profiles existed belong to the default learner."""
+	if "profiles" not in data:
+		modes = data.get("modes", {})
+		data["profiles"] = {DEFAULT_PROFILE: {m: obj["best"] for m, obj in modes.items() if obj and obj.get("best")}}
+	return data
+
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def empty_snapshot() -> Dict[str, Any]:
+	return {
+		"schema_version": SCHEMA_VERSION,
+		"modes": {m: {"best": None} for m in DEFAULT_MODES},
+		"profiles": {},
+		"journal_offset": 0,
+	}
+
+
+def load_snapshot(path: Path) -> Dict[str, Any]:
+	"""Read highscores.json, upgrading it first if it is older than SCHEMA_VERSION.
+
+	An upgrade runs once: the original file is copied to `<name>.v<old>.bak` and the
+	migrated data replaces it atomically. Current files are only read.
+	"""
+	data = read_json(path)
+	if not isinstance(data, dict):
+		return empty_snapshot()
+	version = int(data.get("schema_version", 0))
+	if version >= SCHEMA_VERSION:
+		return data
+	shutil.copy2(path, path.with_name(f"{path.name}.v{version}.bak"))
+	for target, step in MIGRATIONS:
+		if target > version:
+			data = step(data)
+			data["schema_version"] = target
+	write_json(path, data)
+	return data
@@ -0,0 +1,362 @@
+from __future__ import annotations
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+from datetime import datetime
+from pathlib import Path
+import json
+import sqlite3
+import threading
+import uuid
+from ..config.paths import get_high_scores_path, get_scores_db_path
+from ..models.high_score import HighScore
+from .high_score_service import DEFAULT_MODES, DEFAULT_PROFILE
+from .schema import load_snapshot
+from .events import ChangeNotifier
+from .leaderboard import DEFAULT_TOP_K
+from .log_codec import QuestionLog, encode_questions
+from .transfer import chunked
+from .write_behind import WriteBehindQueue, get_write_behind
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+	id TEXT PRIMARY KEY,
+	profile TEXT NOT NULL DEFAULT 'default',
+	mode TEXT NOT NULL,
+	score INTEGER NOT NULL,
+	total INTEGER NOT NULL,
+	timestamp TEXT NOT NULL,
+	questions TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_profile_mode_ts ON attempts (profile, mode, timestamp);
+CREATE INDEX IF NOT EXISTS idx_attempts_mode_score ON attempts (mode, score);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+-- Each learner's best per mode, kept up to date on insert, so leaderboards never scan attempts
+CREATE TABLE IF NOT EXISTS bests (
+	profile TEXT NOT NULL,
+	mode TEXT NOT NULL,
+	score INTEGER NOT NULL,
+	total INTEGER NOT NULL,
+	timestamp TEXT NOT NULL,
+	PRIMARY KEY (profile, mode)
+);
+CREATE INDEX IF NOT EXISTS idx_bests_mode_score ON bests (mode, score DESC, timestamp);
+"""
+
+# Keeps the higher score (the earlier one on a tie), like the leaderboard did
+_UPSERT_BEST = """
+ON CONFLICT (profile, mode) DO UPDATE SET score = excluded.score, total = excluded.total, timestamp = excluded.timestamp
+WHERE excluded.score > bests.score OR (excluded.score = bests.score AND excluded.timestamp < bests.timestamp)
+"""
+_INSERT_BEST = "INSERT INTO bests VALUES (?, ?, ?, ?, ?)" + _UPSERT_BEST
+_COLUMNS = ("id", "profile", "mode", "score", "total", "timestamp", "questions")
+
+
+def _rank(row: Any) -> tuple:
+	return (-row["score"], row["timestamp"])
+
+
+class SQLiteHighScoreService:
+	"""Same API as HighScoreService, backed by an indexed SQLite database in WAL mode."""
+
+	def __init__(self, path: Optional[Path] = None, json_path: Optional[Path] = None, writer: Optional[WriteBehindQueue] = None) -> None:
+		self.path = path or get_scores_db_path()
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		self._writer = writer or get_write_behind()
+		self._lock = threading.Lock()
+		self._pending_rows: List[tuple] = []
+		# Taken off _pending_rows by the writer but not yet committed
+		self._committing: List[tuple] = []
+		self._best_scores: Dict[tuple, Optional[int]] = {}
+		self.changes = ChangeNotifier()
+		self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+		self._db.row_factory = sqlite3.Row
+		self._db.execute("PRAGMA journal_mode=WAL")
+		self._db.execute("PRAGMA synchronous=NORMAL")
+		with self._db:
+			self._db.executescript(_SCHEMA)
+		self._migrate_json(json_path or get_high_scores_path())
+		self._build_bests()
+		self._data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+		# The write-behind thread commits on its own connection, so reads never wait
+		# for an fsync (WAL lets them run alongside it)
+		self._write_db = sqlite3.connect(str(self.path), check_same_thread=False)
+		self._write_db.execute("PRAGMA synchronous=NORMAL")
+
+	def _migrate_json(self, json_path: Path) -> None:
+		"""Import highscores.json and its attempt journal once, on first run."""
+		if self._db.execute("SELECT 1 FROM meta WHERE key = 'migrated_json'").fetchone():
+			return
+		rows = []
+		seen = set()
+		journal_path = json_path.with_name("attempts.jsonl")
+		if journal_path.exists():
+			with journal_path.open("rb") as f:
+				for line in f:
+					try:
+						rec = json.loads(line)
+					except ValueError:
+						continue
+					seen.add((rec["mode"], rec["timestamp"]))
+					rows.append(self._row(rec))
+		# Upgraded first, so a pre-profiles snapshot gets its bests attributed to the default learner
+		data = load_snapshot(json_path)
+		# Bests saved before the journal existed have no attempt record of their own;
+		# a learner's may survive only in "profiles" once someone else beat it class-wide
+		for profile, bests in (data.get("profiles") or {}).items():
+			for mode, best in (bests or {}).items():
+				if best and (mode, best.get("timestamp")) not in seen:
+					seen.add((mode, best.get("timestamp")))
+					rows.append(self._row({**best, "id": f"legacy-{profile}-{mode}", "mode": mode, "profile": profile}))
+		modes = data.get("modes") or {}
+		for mode, mode_obj in modes.items():
+			best = (mode_obj or {}).get("best")
+			if best and (mode, best.get("timestamp")) not in seen:
+				rows.append(self._row({**best, "id": f"legacy-{mode}", "mode": mode}))
+		with self._lock, self._db:
+			self._db.executemany("INSERT OR IGNORE INTO attempts VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+			self._db.execute("INSERT INTO meta VALUES ('migrated_json', ?)", (datetime.now().isoformat(),))
+
+	def _build_bests(self) -> None:
+		"""Fill the bests table from the attempts once (databases created before it existed)."""
+		if self._db.execute("SELECT 1 FROM meta WHERE key = 'bests'").fetchone():
+			return
+		with self._lock, self._db:
+			# "WHERE true" keeps SQLite from reading ON CONFLICT as part of the SELECT
+			self._db.execute("INSERT INTO bests SELECT profile, mode, score, total, timestamp FROM attempts WHERE true" + _UPSERT_BEST)
+			self._db.execute("INSERT INTO meta VALUES ('bests', ?)", (datetime.now().isoformat(),))
+
+	@staticmethod
+	def _insert(db: sqlite3.Connection, rows: List[tuple], ignore_existing: bool = False) -> int:
+		"""Insert attempt rows and fold them into bests; returns how many attempts were new.
+
+		The caller holds a transaction on `db`.
+		"""
+		verb = "INSERT OR IGNORE" if ignore_existing else "INSERT"
+		before = db.total_changes
+		db.executemany(f"{verb} INTO attempts VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+		added = db.total_changes - before
+		# Re-folding an ignored duplicate changes nothing
+		db.executemany(_INSERT_BEST, [row[1:6] for row in rows])
+		return added
+
+	@staticmethod
+	def _row(rec: Dict[str, Any]) -> tuple:
+		return (
+			rec.get("id") or uuid.uuid4().hex,
+			rec.get("profile") or DEFAULT_PROFILE,
+			rec["mode"],
+			int(rec.get("score", 0)),
+			int(rec.get("total", 0)),
+			rec.get("timestamp") or "",
+			json.dumps(rec.get("questions") or [], ensure_ascii=False, separators=(",", ":")),
+		)
+
+	def _unwritten(self) -> List[Dict[str, Any]]:
+		"""Recorded attempts the database may not have yet, as rows keyed like its columns.
+
+		The caller holds the lock. Rows being committed can show up in a query as well;
+		readers drop those by id.
+		"""
+		return [dict(zip(_COLUMNS, row)) for row in self._committing + self._pending_rows]
+
+	@staticmethod
+	def _attempt(row: Any) -> Dict[str, Any]:
+		return {
+			"id": row["id"],
+			"profile": row["profile"],
+			"mode": row["mode"],
+			"score": row["score"],
+			"total": row["total"],
+			"timestamp": row["timestamp"],
+			"questions": json.loads(row["questions"]),
+		}
+
+	def _best_row(self, mode: str, profile: Optional[str] = None) -> Optional[sqlite3.Row]:
+		if profile is not None:
+			return self._db.execute(
+				"SELECT * FROM attempts WHERE profile = ? AND mode = ? ORDER BY score DESC, timestamp ASC LIMIT 1", (profile, mode)
+			).fetchone()
+		return self._db.execute(
+			"SELECT * FROM attempts WHERE mode = ? ORDER BY score DESC, timestamp ASC LIMIT 1", (mode,)
+		).fetchone()
+
+	def record_attempt(self, mode: str, score: int, total: int, questions: Union[QuestionLog, List[Dict[str, Any]]], on_saved: Optional[Callable[[], None]] = None, profile: str = DEFAULT_PROFILE) -> bool:
+		"""Record a quiz attempt. Returns True if it's the learner's new high score, False otherwise.
+
+		The insert runs on the write-behind thread; `on_saved` is called once it is committed.
+		"""
+		rec = {"profile": profile, "mode": mode, "score": score, "total": total, "timestamp": datetime.now().isoformat(), "questions": encode_questions(questions)}
+		key = (profile, mode)
+		with self._lock:
+			if key not in self._best_scores:
+				row = self._db.execute("SELECT score FROM bests WHERE profile = ? AND mode = ?", key).fetchone()
+				scores = [r["score"] for r in self._unwritten() if (r["profile"], r["mode"]) == key]
+				if row:
+					scores.append(row[0])
+				self._best_scores[key] = max(scores, default=None)
+			best = self._best_scores[key]
+			is_new_high_score = best is None or int(score) > best
+			if is_new_high_score:
+				self._best_scores[key] = int(score)
+			self._pending_rows.append(self._row(rec))
+		self._writer.submit(f"sqlite:{self.path}", self._write_rows, on_saved)
+		if is_new_high_score:
+			self.changes.notify()
+		return is_new_high_score
+
+	def _write_rows(self) -> None:
+		with self._lock:
+			rows, self._pending_rows = self._pending_rows, []
+			self._committing = rows
+		if not rows:
+			return
+		try:
+			with self._write_db:
+				self._insert(self._write_db, rows)
+		except BaseException:
+			# Rolled back; keep them for the queue's retry
+			with self._lock:
+				self._pending_rows[:0] = rows
+				self._committing = []
+			raise
+		with self._lock:
+			self._committing = []
+
+	def flush(self, timeout: Optional[float] = None) -> bool:
+		"""Wait for queued inserts to be committed."""
+		return self._writer.flush(timeout)
+
+	# Reads never write: attempts still queued are merged in from memory
+
+	def get_best(self, mode: str, profile: Optional[str] = None) -> Dict | None:
+		"""Best attempt for a mode: the learner's own if `profile` is given, else the class best."""
+		with self._lock:
+			row = self._best_row(mode, profile)
+			rows = [r for r in self._unwritten() if r["mode"] == mode and profile in (None, r["profile"])]
+		if row is not None:
+			rows.append(row)
+		if not rows:
+			return None
+		best = self._attempt(min(rows, key=_rank))
+		return {k: best[k] for k in ("score", "total", "timestamp", "questions")}
+
+	def get_overview(self) -> Dict[str, Dict]:
+		with self._lock:
+			modes = [r[0] for r in self._db.execute("SELECT DISTINCT mode FROM attempts")]
+			modes += [r["mode"] for r in self._unwritten()]
+		return {mode: {"best": self.get_best(mode)} for mode in dict.fromkeys(DEFAULT_MODES + modes)}
+
+	def get_leaderboard(self, mode: str, k: int = DEFAULT_TOP_K) -> List[HighScore]:
+		"""Top learners for a mode by personal best, highest first."""
+		with self._lock:
+			unwritten = [r for r in self._unwritten() if r["mode"] == mode]
+			# Each learner with unwritten attempts can push at most one stored row out of the top k
+			rows = self._db.execute(
+				"SELECT profile, score, total, timestamp FROM bests WHERE mode = ? ORDER BY score DESC, timestamp ASC LIMIT ?",
+				(mode, k + len({r["profile"] for r in unwritten})),
+			).fetchall()
+		bests = {r["profile"]: r for r in rows}
+		for r in unwritten:
+			if r["profile"] not in bests or _rank(r) < _rank(bests[r["profile"]]):
+				bests[r["profile"]] = r
+		top = sorted(bests.values(), key=_rank)[:k]
+		return [HighScore(r["profile"], r["score"], r["total"], r["timestamp"]) for r in top]
+
+	def get_profiles(self) -> List[str]:
+		with self._lock:
+			profiles = [r[0] for r in self._db.execute("SELECT DISTINCT profile FROM bests")]
+			profiles += [r["profile"] for r in self._unwritten()]
+		return list(dict.fromkeys(profiles))
+
+	def get_attempts(self, mode: str) -> List[Dict]:
+		"""Full attempt history for a mode, oldest first."""
+		with self._lock:
+			unwritten = [r for r in self._unwritten() if r["mode"] == mode]
+			ids = [r["id"] for r in unwritten]
+			rows = self._db.execute(
+				f"SELECT * FROM attempts WHERE mode = ? AND id NOT IN ({', '.join('?' * len(ids))}) ORDER BY timestamp", (mode, *ids)
+			).fetchall()
+		return [self._attempt(r) for r in sorted([*rows, *unwritten], key=lambda r: r["timestamp"])]
+
+	def iter_attempts(self, chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+		"""Every attempt in insertion order, fetched in chunks."""
+		with self._lock:
+			unwritten = self._unwritten()
+		ids = [r["id"] for r in unwritten]
+		last = 0
+		while True:
+			with self._lock:
+				rows = self._db.execute(
+					f"SELECT rowid, * FROM attempts WHERE rowid > ? AND id NOT IN ({', '.join('?' * len(ids))}) ORDER BY rowid LIMIT ?",
+					(last, *ids, chunk_size),
+				).fetchall()
+			if not rows:
+				break
+			for row in rows:
+				yield self._attempt(row)
+			last = rows[-1]["rowid"]
+		for row in unwritten:
+			yield self._attempt(row)
+
+	def read_attempts_after(self, cursor: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+		"""Up to `limit` committed attempts inserted after `cursor` (a rowid), and the next cursor.
+
+		Attempts still queued have no rowid yet; a later call picks them up.
+		"""
+		with self._lock:
+			rows = self._db.execute(
+				"SELECT rowid, * FROM attempts WHERE rowid > ? ORDER BY rowid LIMIT ?", (cursor, limit)
+			).fetchall()
+		return [self._attempt(r) for r in rows], (rows[-1]["rowid"] if rows else cursor)
+
+	def import_attempts(self, records: Iterable[Dict[str, Any]], chunk_size: int = 1000) -> int:
+		"""Insert attempts exported from other devices; ids already stored are skipped. Returns how many were new."""
+		self.flush()
+		added = 0
+		for chunk in chunked(records, chunk_size):
+			rows = [self._row(r) for r in chunk]
+			with self._lock, self._db:
+				added += self._insert(self._db, rows, ignore_existing=True)
+		with self._lock:
+			self._best_scores.clear()
+		if added:
+			self.changes.notify()
+		return added
+
+	def get_history(self, mode: str, page: int = 0, page_size: int = 20, profile: str = DEFAULT_PROFILE) -> List[Dict]:
+		"""One page of a learner's attempts for a mode, newest first."""
+		start = page * page_size
+		with self._lock:
+			# Unwritten attempts are the newest, so they come first
+			unwritten = sorted((r for r in self._unwritten() if r["profile"] == profile and r["mode"] == mode), key=lambda r: r["timestamp"], reverse=True)
+			ids = [r["id"] for r in unwritten]
+			offset = max(0, start - len(unwritten))
+			rows = self._db.execute(
+				f"SELECT * FROM attempts WHERE profile = ? AND mode = ? AND id NOT IN ({', '.join('?' * len(ids))}) "
+				"ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+				(profile, mode, *ids, max(0, start + page_size - len(unwritten) - offset), offset),
+			).fetchall()
+		return [self._attempt(r) for r in [*unwritten[start:start + page_size], *rows]]
+
+	def refresh(self) -> None:
+		"""Queries always read the database; this only notices commits made by other
+		connections (data_version changes, the write-behind one's included) so subscribers can be told."""
+		with self._lock:
+			version = self._db.execute("PRAGMA data_version").fetchone()[0]
+			changed, self._data_version = version != self._data_version, version
+			if changed:
+				self._best_scores.clear()
+		if changed:
+			self.changes.notify()
+
+	def subscribe(self, callback: Callable[[], None]) -> None:
+		"""Call `callback` on the main thread whenever bests may have changed."""
+		self.changes.subscribe(callback)
+
+	def unsubscribe(self, callback: Callable[[], None]) -> None:
+		self.changes.unsubscribe(callback)
+
+	def close(self) -> None:
+		self.flush()
+		with self._lock:
+			self._db.close()
+			self._write_db.close()
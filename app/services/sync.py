@@ -0,0 +1,158 @@
+from __future__ import annotations
+from typing import Any, Dict, Optional
+from pathlib import Path
+import gzip
+import json
+import logging
+import os
+import random
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from ..config.paths import get_sync_state_path
+from ..utils.json_store import read_json, write_json
+from .high_score_service import get_high_score_service
+
+
+logger = logging.getLogger(__name__)
+
+SYNC_URL_ENV = "LEARNBRIGHT_SYNC_URL"
+BATCH_SIZE = 500
+POLL_INTERVAL = 30.0
+BACKOFF_START = 2.0
+BACKOFF_MAX = 300.0
+
+
+class SyncClient:
+	"""Uploads finished attempts to the classroom aggregation server in gzip batches.
+
+	The attempt journal (or the SQLite table) is the outbox: a cursor in
+	sync_state.json marks what the server has acknowledged, so nothing is lost while
+	offline and everything after the cursor goes up once the server is reachable.
+	The server ignores attempt ids it already has, so re-sending after a crash is safe.
+	An attempt the server can't store is logged and skipped rather than retried, so one
+	bad record never holds up the ones behind it.
+	"""
+
+	def __init__(self, url: str, service=None, state_path: Optional[Path] = None, batch_size: int = BATCH_SIZE, timeout: float = 10.0) -> None:
+		self.url = url.rstrip("/")
+		self.service = service or get_high_score_service()
+		self.state_path = state_path or get_sync_state_path()
+		self.batch_size = batch_size
+		self.timeout = timeout
+		self._backend = type(self.service).__name__
+		state = read_json(self.state_path)
+		if not isinstance(state, dict):
+			state = {}
+		state.setdefault("device_id", uuid.uuid4().hex)
+		if state.get("backend") != self._backend:
+			# A cursor is only meaningful for the store it was taken from
+			state.update(backend=self._backend, cursor=0)
+		self._state: Dict[str, Any] = state
+		self._wake = threading.Event()
+		self._stop = threading.Event()
+		self._thread: Optional[threading.Thread] = None
+
+	@property
+	def device_id(self) -> str:
+		return self._state["device_id"]
+
+	def _post(self, attempts) -> Dict[str, Any]:
+		body = gzip.compress(json.dumps({"device": self.device_id, "attempts": attempts}, separators=(",", ":")).encode("utf-8"))
+		request = urllib.request.Request(
+			f"{self.url}/attempts",
+			data=body,
+			method="POST",
+			headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+		)
+		with urllib.request.urlopen(request, timeout=self.timeout) as response:
+			reply = json.loads(response.read() or b"{}")
+		return reply if isinstance(reply, dict) else {}
+
+	def _send(self, attempts) -> int:
+		"""Post a batch; returns how many attempts the server accepted.
+
+		A 4xx means the server will never take this batch as it is (a server that
+		rejects whole batches over one bad attempt), so it is split in halves until the
+		offending attempts are isolated and skipped. Other errors propagate.
+		"""
+		try:
+			rejected = self._post(attempts).get("rejected") or []
+		except urllib.error.HTTPError as exc:
+			if not 400 <= exc.code < 500 or exc.code in (408, 429):
+				raise
+			if len(attempts) == 1:
+				logger.warning("results sync: server refused attempt %s (%s); skipping it", attempts[0].get("id"), exc)
+				return 0
+			half = len(attempts) // 2
+			return self._send(attempts[:half]) + self._send(attempts[half:])
+		for attempt_id in rejected:
+			logger.warning("results sync: server rejected attempt %s; skipping it", attempt_id)
+		return len(attempts) - len(rejected)
+
+	def sync_once(self) -> int:
+		"""Send everything after the cursor. Returns how many attempts were uploaded.
+
+		Network and server errors propagate; the cursor only moves past batches the
+		server accepted or rejected as malformed.
+		"""
+		sent = 0
+		while True:
+			attempts, cursor = self.service.read_attempts_after(self._state["cursor"], self.batch_size)
+			if not attempts:
+				if cursor != self._state["cursor"]:
+					self._state["cursor"] = cursor
+					write_json(self.state_path, self._state)
+				return sent
+			sent += self._send(attempts)
+			self._state["cursor"] = cursor
+			write_json(self.state_path, self._state)
+
+	def notify(self) -> None:
+		"""Ask the background loop to sync now instead of at the next poll."""
+		self._wake.set()
+
+	def start(self) -> None:
+		if self._thread is None:
+			self._thread = threading.Thread(target=self._run, name="results-sync", daemon=True)
+			self._thread.start()
+
+	def stop(self) -> None:
+		self._stop.set()
+		self._wake.set()
+
+	def _run(self) -> None:
+		delay = BACKOFF_START
+		while not self._stop.is_set():
+			try:
+				sent = self.sync_once()
+				if sent:
+					logger.info("synced %d attempts to %s", sent, self.url)
+				delay = BACKOFF_START
+				wait = POLL_INTERVAL
+			except (OSError, ValueError) as exc:
+				# Offline or server trouble: back off exponentially, with jitter
+				logger.info("results sync failed (%s); retrying in %.0fs", exc, delay)
+				wait = delay * random.uniform(0.5, 1.0)
+				delay = min(delay * 2, BACKOFF_MAX)
+			self._wake.wait(wait)
+			self._wake.clear()
+
+
+_client: Optional[SyncClient] = None
+
+
+def start_sync_from_env() -> Optional[SyncClient]:
+	"""Start background sync if LEARNBRIGHT_SYNC_URL is set; the app works fully offline otherwise."""
+	global _client
+	url = os.environ.get(SYNC_URL_ENV)
+	if url and _client is None:
+		_client = SyncClient(url)
+		_client.start()
+	return _client
+
+
+def notify_sync() -> None:
+	if _client is not None:
+		_client.notify()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional
+from itertools import islice
+from pathlib import Path
+import csv
+import gzip
+import hashlib
+import io
+import json
+from ..utils.id_set import DiskIdSet
+from .schema import DEFAULT_PROFILE
+
+
+# Column order for CSV exports; JSON Lines records use the same keys
+FIELDS = ("id", "profile", "mode", "score", "total", "timestamp", "questions")
+FORMATS = ("csv", "jsonl")
+
+
+def normalize(record: Dict[str, Any]) -> Dict[str, Any]:
+	"""An attempt with exactly FIELDS, typed the way the score stores write them.
+
+	Rows from hand-made spreadsheets may lack an id; they get one derived from their
+	content so importing the same file twice still finds the duplicates.
+	"""
+	questions = record.get("questions") or []
+	if isinstance(questions, str) and questions.startswith("["):
+		questions = json.loads(questions)  # a dict-list log flattened into a CSV cell
+	out = {
+		"profile": record.get("profile") or DEFAULT_PROFILE,
+		"mode": str(record["mode"]),
+		"score": int(record.get("score") or 0),
+		"total": int(record.get("total") or 0),
+		"timestamp": record.get("timestamp") or "",
+		"questions": questions,
+	}
+	attempt_id = record.get("id")
+	if not attempt_id:
+		digest = hashlib.sha1(json.dumps(out, sort_keys=True).encode("utf-8")).hexdigest()
+		attempt_id = f"import-{digest[:32]}"
+	return {"id": str(attempt_id), **out}
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+	it = iter(items)
+	while True:
+		chunk = list(islice(it, size))
+		if not chunk:
+			return
+		yield chunk
+
+
+def read_jsonl(f: IO[str]) -> Iterator[Dict[str, Any]]:
+	for line in f:
+		if line.strip():
+			yield normalize(json.loads(line))
+
+
+def read_csv(f: IO[str]) -> Iterator[Dict[str, Any]]:
+	for row in csv.DictReader(f):
+		yield normalize(row)
+
+
+def write_jsonl(records: Iterable[Dict[str, Any]], f: IO[str]) -> int:
+	count = 0
+	for record in records:
+		f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+		f.write("\n")
+		count += 1
+	return count
+
+
+def write_csv(records: Iterable[Dict[str, Any]], f: IO[str]) -> int:
+	writer = csv.writer(f)
+	writer.writerow(FIELDS)
+	count = 0
+	for record in records:
+		questions = record.get("questions") or ""
+		if not isinstance(questions, str):
+			questions = json.dumps(questions, ensure_ascii=False, separators=(",", ":"))
+		writer.writerow([record.get("id", ""), record.get("profile", DEFAULT_PROFILE), record["mode"], record["score"], record["total"], record.get("timestamp", ""), questions])
+		count += 1
+	return count
+
+
+def format_of(path: Path, default: Optional[str] = None) -> str:
+	"""csv or jsonl from the file name (a trailing .gz is allowed)."""
+	suffixes = [s.lower() for s in path.suffixes if s.lower() != ".gz"]
+	suffix = suffixes[-1].lstrip(".") if suffixes else ""
+	if suffix in ("jsonl", "ndjson", "json"):
+		return "jsonl"
+	if suffix == "csv":
+		return "csv"
+	if default:
+		return default
+	raise ValueError(f"can't tell the format of {path}; use a .csv or .jsonl name")
+
+
+def open_text(path: Path, mode: str = "r") -> IO[str]:
+	"""Open for streaming text I/O; .gz files are (de)compressed on the fly."""
+	newline = "" if format_of(path, "jsonl") == "csv" else None
+	if path.suffix.lower() == ".gz":
+		return io.TextIOWrapper(gzip.open(path, mode + "b"), encoding="utf-8", newline=newline)
+	return path.open(mode, encoding="utf-8", newline=newline)
+
+
+def read_file(path: Path) -> Iterator[Dict[str, Any]]:
+	reader = read_csv if format_of(path) == "csv" else read_jsonl
+	with open_text(path) as f:
+		yield from reader(f)
+
+
+def write_file(records: Iterable[Dict[str, Any]], path: Path) -> int:
+	writer = write_csv if format_of(path) == "csv" else write_jsonl
+	with open_text(path, "w") as f:
+		return writer(records, f)
+
+
+def dedupe(records: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+	"""Drop attempts whose id was already seen; the id index lives on disk, not in memory."""
+	with DiskIdSet() as seen:
+		for record in records:
+			if seen.add(record["id"]):
+				yield record
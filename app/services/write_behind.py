@@ -0,0 +1,155 @@
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], None]
+Callback = Callable[[], None]
+
+# Backoff between retries of a failed job (seconds)
+RETRY_BASE = 0.5
+RETRY_MAX = 30.0
+
+
+def clock_dispatch(callback: Callback) -> None:
+	"""Run `callback` on the Kivy main thread (or inline when Kivy isn't loaded)."""
+	try:
+		from kivy.clock import Clock
+	except ImportError:
+		callback()
+		return
+	Clock.schedule_once(lambda _dt: callback())
+
+
+class WriteBehindQueue:
+	"""Runs disk writes on one worker thread.
+
+	Jobs are keyed; submitting a key that is still pending replaces the queued job
+	instead of adding another, so a burst of saves becomes one write. Callbacks run
+	after the job through `dispatch` (the Kivy clock by default).
+
+	A job that raises (disk full, storage briefly unavailable) stays queued with its
+	callbacks and is retried with backoff, so its callbacks only ever run once the
+	write succeeded. Jobs must leave their data in place when they fail.
+	"""
+
+	def __init__(self, name: str = "write-behind", dispatch: Callable[[Callback], None] = clock_dispatch) -> None:
+		self.name = name
+		self._dispatch = dispatch
+		self._cond = threading.Condition()
+		self._pending: Dict[str, Tuple[Job, List[Callback]]] = {}
+		self._failed: Set[str] = set()
+		self._failures = 0
+		self._retry_at = 0.0
+		self._runs = 0
+		self._busy = False
+		self._stopped = False
+		self._thread: Optional[threading.Thread] = None
+
+	def submit(self, key: str, job: Job, callback: Optional[Callback] = None) -> None:
+		with self._cond:
+			if self._stopped:
+				raise RuntimeError("write-behind queue is stopped")
+			callbacks = self._pending.pop(key, (None, []))[1]
+			if callback is not None:
+				callbacks.append(callback)
+			self._pending[key] = (job, callbacks)
+			if self._thread is None:
+				self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+				self._thread.start()
+			self._cond.notify_all()
+
+	def _only_failed(self) -> bool:
+		return self._pending.keys() <= self._failed
+
+	def _run(self) -> None:
+		while True:
+			with self._cond:
+				while True:
+					if not self._pending:
+						if self._stopped:
+							return
+						self._cond.wait()
+					elif not self._only_failed():
+						break
+					elif self._stopped:
+						return  # flush() already gave them a last try
+					else:
+						delay = self._retry_at - time.monotonic()
+						if delay <= 0:
+							break
+						self._cond.wait(delay)
+				batch = list(self._pending.items())
+				self._pending.clear()
+				self._busy = True
+			failed = []
+			for key, (job, callbacks) in batch:
+				try:
+					job()
+				except Exception:
+					logger.exception("write-behind job %r failed; will retry", key)
+					failed.append((key, job, callbacks))
+					continue
+				for callback in callbacks:
+					self._dispatch(callback)
+			with self._cond:
+				self._failed.clear()
+				for key, job, callbacks in failed:
+					# A newer submit for the key replaces the job but keeps the old callbacks
+					newer_job, newer_callbacks = self._pending.pop(key, (job, []))
+					self._pending[key] = (newer_job, callbacks + newer_callbacks)
+					self._failed.add(key)
+				if failed:
+					self._failures += 1
+					self._retry_at = time.monotonic() + min(RETRY_MAX, RETRY_BASE * 2 ** (self._failures - 1))
+				else:
+					self._failures = 0
+				self._runs += 1
+				self._busy = False
+				self._cond.notify_all()
+
+	def flush(self, timeout: Optional[float] = None) -> bool:
+		"""Block until every submitted job has run. Returns False on timeout, or when
+		a failed job fails again on the immediate retry flush gives it."""
+		deadline = None if timeout is None else time.monotonic() + timeout
+		retried_at: Optional[int] = None
+		with self._cond:
+			while self._pending or self._busy:
+				if not self._busy and self._only_failed():
+					if retried_at is not None and self._runs > retried_at:
+						return False
+					if retried_at is None:
+						# Don't wait out the backoff; give them one more try now
+						retried_at = self._runs
+						self._retry_at = 0.0
+						self._cond.notify_all()
+				remaining = None if deadline is None else deadline - time.monotonic()
+				if remaining is not None and remaining <= 0:
+					return False
+				self._cond.wait(remaining)
+			return True
+
+	def stop(self, timeout: Optional[float] = None) -> None:
+		with self._cond:
+			self._stopped = True
+			self._cond.notify_all()
+		if self._thread is not None:
+			self._thread.join(timeout)
+
+
+_queue: Optional[WriteBehindQueue] = None
+
+
+def get_write_behind() -> WriteBehindQueue:
+	global _queue
+	if _queue is None:
+		_queue = WriteBehindQueue()
+	return _queue
+
+
+def flush_pending_writes(timeout: Optional[float] = None) -> bool:
+	return _queue.flush(timeout) if _queue is not None else True
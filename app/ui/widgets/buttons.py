@@ -6,7 +6,7 @@ from kivy.uix.floatlayout import FloatLayout
 from kivy.properties import ListProperty, StringProperty, NumericProperty, BooleanProperty
 from kivy.uix.behaviors import ButtonBehavior
 from kivy.graphics import Color, RoundedRectangle, Ellipse
-from ...utils.assets import resolve_image_path
+from ...utils.assets import resolve_icon
 from .. import theme
 
 
@@ -28,21 +28,28 @@ class IconRoundButton(ButtonBehavior, BoxLayout):
 		self.hover_color = self._hex_to_rgba("#00B7EA") if hover_color is None else hover_color
 		self.text_color = self._hex_to_rgba(theme.PRIMARY_TEXT) if text_color is None else text_color
 		self._bg_rect = None
+		self._label = None
 		self._draw_background(self.bg_color)
 		self._build_content()
 
+	def on_text(self, _instance, value):
+		# Also fires from __init__, before the label exists
+		label = getattr(self, "_label", None)
+		if label is not None:
+			label.text = value
+
 	def _build_content(self):
 		self.clear_widgets()
 		if self.icon_name:
-			icon_path = resolve_image_path(self.icon_name)
+			icon_path = resolve_icon(self.icon_name)
 			if icon_path:
 				# Wrap icon in a centered container
 				from kivy.uix.anchorlayout import AnchorLayout
 				icon_container = AnchorLayout(size_hint=(None, 1), width=28, anchor_x='center', anchor_y='center')
 				icon_container.add_widget(Image(source=icon_path, size_hint=(None, None), size=(28, 28), allow_stretch=True, keep_ratio=True))
 				self.add_widget(icon_container)
-		label = Label(text=self.text, color=self.text_color, font_size='20sp', bold=True)
-		self.add_widget(label)
+		self._label = Label(text=self.text, color=self.text_color, font_size='20sp', bold=True)
+		self.add_widget(self._label)
 
 	def _draw_background(self, rgba):
 		self.canvas.before.clear()
@@ -94,7 +101,7 @@ class BackCircleButton(ButtonBehavior, FloatLayout):
 	def _set_icon(self):
 		if self._icon_widget is not None:
 			self.remove_widget(self._icon_widget)
-		path = resolve_image_path(self.icon_name)
+		path = resolve_icon(self.icon_name)
 		if path:
 			self._icon_widget = Image(source=path, size_hint=(None, None), size=(int(self.diameter*0.6), int(self.diameter*0.6)), pos_hint={"center_x": 0.5, "center_y": 0.5})
 			self.add_widget(self._icon_widget)
@@ -1,20 +1,142 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Optional
+from typing import Dict, FrozenSet, Optional, Tuple
+import json
+import os
+import sys
+import time
 try:
 	from ..config.paths import get_assets_dir
 except ImportError:
 	# Allow running this module directly
-	import sys
 	from pathlib import Path as _P
 	sys.path.append(str(_P(__file__).resolve().parents[2]))
 	from app.config.paths import get_assets_dir
 
 
+# Display-sized copies of large images are written by convert_icon.py to
+# assets/scaled/<bucket>/, one per bucket; the scale is relative to a 160 dpi screen
+SCALED_DIR = "scaled"
+DPI_BUCKETS: Tuple[Tuple[str, float], ...] = (("mdpi", 1.0), ("hdpi", 1.5), ("xhdpi", 2.0), ("xxhdpi", 3.0))
+_dpi_bucket: Optional[str] = None
+
+# Small icons are packed into assets/atlas/icons.atlas by convert_icon.py; widgets
+# reference them by atlas key so a menu screen uploads one texture instead of dozens
+ICON_ATLAS = "icons"
+LOOSE_ICONS_ENV = "LEARNBRIGHT_LOOSE_ICONS"
+
+# In development the asset directories are re-checked at most this often
+DEV_RECHECK_SECONDS = 2.0
+
+
+def dpi_bucket() -> str:
+	"""Smallest bucket that is at least as dense as this screen (mdpi without Kivy)."""
+	global _dpi_bucket
+	if _dpi_bucket is None:
+		try:
+			from kivy.metrics import Metrics
+			scale = Metrics.dpi / 160.0
+		except Exception:
+			scale = 1.0
+		_dpi_bucket = next((name for name, s in DPI_BUCKETS if s >= scale), DPI_BUCKETS[-1][0])
+	return _dpi_bucket
+
+
+class AssetRegistry:
+	"""In-memory index of the image files and atlas keys under assets/.
+
+	The directories are listed once, on first lookup, and lookups are answered from
+	memory. When `watch` is set (development) the directories' modification times are
+	compared at most every DEV_RECHECK_SECONDS and the index is rebuilt if a file was
+	added, removed or rebuilt; a bundled app never touches the disk again.
+	"""
+
+	def __init__(self, root: Path, bucket: str, watch: bool = False) -> None:
+		self.root = root
+		self.watch = watch
+		self.scaled_dir = os.path.join(SCALED_DIR, bucket)
+		self._watched = ("", "images", SCALED_DIR, self.scaled_dir, "atlas")
+		self._files: Dict[str, FrozenSet[str]] = {}
+		self._atlas_keys: FrozenSet[str] = frozenset()
+		self._stamps: Tuple[Optional[int], ...] = ()
+		self._loaded = False
+		self._next_check = 0.0
+
+	def _stamp(self) -> Tuple[Optional[int], ...]:
+		stamps = []
+		for rel in self._watched:
+			try:
+				stamps.append(os.stat(os.path.join(self.root, rel)).st_mtime_ns)
+			except OSError:
+				stamps.append(None)
+		return tuple(stamps)
+
+	def _list(self, rel: str) -> FrozenSet[str]:
+		try:
+			with os.scandir(os.path.join(self.root, rel)) as entries:
+				return frozenset(entry.name for entry in entries if entry.is_file())
+		except OSError:
+			return frozenset()
+
+	def _scan(self) -> None:
+		self._stamps = self._stamp() if self.watch else ()
+		self._files = {rel: self._list(rel) for rel in ("images", self.scaled_dir, "atlas")}
+		keys: FrozenSet[str] = frozenset()
+		if f"{ICON_ATLAS}.atlas" in self._files["atlas"] and not os.environ.get(LOOSE_ICONS_ENV):
+			try:
+				with open(os.path.join(self.root, "atlas", f"{ICON_ATLAS}.atlas"), "r", encoding="utf-8") as f:
+					keys = frozenset(key for page in json.load(f).values() for key in page)
+			except (OSError, ValueError, AttributeError):
+				pass
+		self._atlas_keys = keys
+		self._loaded = True
+
+	def _current(self) -> Dict[str, FrozenSet[str]]:
+		if not self._loaded:
+			self._scan()
+		elif self.watch:
+			now = time.monotonic()
+			if now >= self._next_check:
+				self._next_check = now + DEV_RECHECK_SECONDS
+				if self._stamp() != self._stamps:
+					self._scan()
+		return self._files
+
+	def invalidate(self) -> None:
+		"""Forget the index; the next lookup lists the directories again."""
+		self._loaded = False
+
+	def path(self, rel_dir: str, filename: str) -> Optional[str]:
+		"""Full path of `rel_dir/filename` if it exists, without touching the disk."""
+		if filename in self._current().get(rel_dir, ()):
+			return os.path.join(self.root, rel_dir, filename)
+		return None
+
+	def atlas_keys(self) -> FrozenSet[str]:
+		self._current()
+		return self._atlas_keys
+
+
+_registry: Optional[AssetRegistry] = None
+
+
+def get_asset_registry() -> AssetRegistry:
+	global _registry
+	if _registry is None:
+		# Only a source checkout has assets that change under a running app; PyInstaller
+		# sets sys.frozen, python-for-android and kivy-ios set these variables
+		bundled = getattr(sys, "frozen", False) or "ANDROID_ARGUMENT" in os.environ or os.environ.get("KIVY_BUILD") == "ios"
+		_registry = AssetRegistry(get_assets_dir(), dpi_bucket(), watch=not bundled)
+	return _registry
+
+
 def resolve_image_path(filename: str) -> Optional[str]:
-	"""Return full path to an image file under assets/images if it exists."""
-	path = get_assets_dir() / "images" / filename
-	return str(path) if path.exists() else None
+	"""Return full path to an image file under assets/images if it exists.
+
+	A prebuilt variant for this screen's DPI bucket is preferred over the original.
+	"""
+	registry = get_asset_registry()
+	return registry.path(registry.scaled_dir, filename) or registry.path("images", filename)
 
 
 def first_existing_image(*filenames: str) -> Optional[str]:
@@ -23,4 +145,17 @@ def first_existing_image(*filenames: str) -> Optional[str]:
 		p = resolve_image_path(name)
 		if p:
 			return p
-	return None
\ No newline at end of file
+	return None
+
+
+def resolve_icon(filename: str) -> Optional[str]:
+	"""Kivy source for a small icon: its atlas key when the atlas is built, else the loose file.
+
+	Without a built atlas (or with LEARNBRIGHT_LOOSE_ICONS set, handy while editing
+	icons) this is the same as resolve_image_path.
+	"""
+	registry = get_asset_registry()
+	key = Path(filename).stem
+	if key in registry.atlas_keys():
+		return f"atlas://{Path(registry.root, 'atlas', ICON_ATLAS).as_posix()}/{key}"
+	return resolve_image_path(filename)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from pathlib import Path
+import os
+import threading
+
+if os.name == "nt":
+	import msvcrt
+else:
+	import fcntl
+
+
+class FileLock:
+	"""Advisory lock shared between processes (and threads) through a lock file.
+
+	Only cooperating code that takes the same lock is excluded; plain readers never
+	block. Usage: `with FileLock(path): ...`.
+	"""
+
+	def __init__(self, path: Path) -> None:
+		self.path = path
+		self._thread_lock = threading.Lock()
+		self._fd = None
+
+	def acquire(self) -> None:
+		self._thread_lock.acquire()
+		try:
+			self.path.parent.mkdir(parents=True, exist_ok=True)
+			fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+			try:
+				if os.name == "nt":
+					# Blocks (retrying internally) until the first byte is free
+					while True:
+						try:
+							msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+							break
+						except OSError:
+							continue
+				else:
+					fcntl.flock(fd, fcntl.LOCK_EX)
+			except BaseException:
+				os.close(fd)
+				raise
+			self._fd = fd
+		except BaseException:
+			self._thread_lock.release()
+			raise
+
+	def release(self) -> None:
+		fd, self._fd = self._fd, None
+		try:
+			if os.name == "nt":
+				os.lseek(fd, 0, os.SEEK_SET)
+				msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+			else:
+				fcntl.flock(fd, fcntl.LOCK_UN)
+		finally:
+			os.close(fd)
+			self._thread_lock.release()
+
+	def __enter__(self) -> "FileLock":
+		self.acquire()
+		return self
+
+	def __exit__(self, *_exc) -> None:
+		self.release()
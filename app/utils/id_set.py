@@ -0,0 +1,36 @@
+from __future__ import annotations
+from typing import Optional
+import os
+import shutil
+import sqlite3
+import tempfile
+
+
+class DiskIdSet:
+	"""Set of string ids kept in a temporary SQLite file, so memory stays flat no matter
+	how many ids are added. Usage: `with DiskIdSet() as seen: if seen.add(id): ...`."""
+
+	def __init__(self, directory: Optional[str] = None) -> None:
+		self._dir = tempfile.mkdtemp(prefix="ids-", dir=directory)
+		self._db = sqlite3.connect(os.path.join(self._dir, "ids.db"))
+		# Scratch data: nothing to recover after a crash
+		self._db.execute("PRAGMA journal_mode=OFF")
+		self._db.execute("PRAGMA synchronous=OFF")
+		self._db.execute("CREATE TABLE ids (id TEXT PRIMARY KEY) WITHOUT ROWID")
+
+	def add(self, item: str) -> bool:
+		"""Add `item`; returns True if it wasn't in the set yet."""
+		return self._db.execute("INSERT OR IGNORE INTO ids VALUES (?)", (item,)).rowcount == 1
+
+	def __contains__(self, item: str) -> bool:
+		return self._db.execute("SELECT 1 FROM ids WHERE id = ?", (item,)).fetchone() is not None
+
+	def close(self) -> None:
+		self._db.close()
+		shutil.rmtree(self._dir, ignore_errors=True)
+
+	def __enter__(self) -> "DiskIdSet":
+		return self
+
+	def __exit__(self, *_exc) -> None:
+		self.close()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 
 def read_json(path: Path) -> Optional[Any]:
@@ -15,6 +17,89 @@ def read_json(path: Path) -> Optional[Any]:
 
 
 def write_json(path: Path, data: Any) -> None:
+	write_bytes_atomic(path, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
+def dumps_chunked(data: Any, chunk_size: int = 512) -> bytes:
+	"""Compact UTF-8 JSON for `data`, encoded a slice of at most `chunk_size` dict items at a time.
+
+	For big tables saved from a worker thread: the C encoder holds the GIL for a whole
+	json.dumps call, so one call over tens of thousands of entries would stall the UI
+	thread just as if it ran there. Dicts may gain or lose keys meanwhile (their items
+	are copied first); values are read as they are when their slice is encoded.
+	"""
+	parts: List[str] = []
+	_encode_into(data, chunk_size, parts)
+	return "".join(parts).encode("utf-8")
+
+
+def _encode_into(obj: Any, chunk_size: int, out: List[str]) -> None:
+	if not isinstance(obj, dict):
+		out.append(json.dumps(obj, ensure_ascii=False, separators=(",", ":")))
+		return
+	items = list(obj.items())
+	out.append("{")
+	first = True
+	i = 0
+	while i < len(items):
+		if not first:
+			out.append(",")
+		first = False
+		key, value = items[i]
+		if isinstance(value, dict):
+			out.append(json.dumps(str(key), ensure_ascii=False) + ":")
+			_encode_into(value, chunk_size, out)
+			i += 1
+			continue
+		end = i + 1
+		while end < len(items) and end - i < chunk_size and not isinstance(items[end][1], dict):
+			end += 1
+		out.append(json.dumps(dict(items[i:end]), ensure_ascii=False, separators=(",", ":"))[1:-1])
+		i = end
+	out.append("}")
+
+
+def write_bytes_atomic(path: Path, payload: bytes) -> None:
+	"""Replace `path` with `payload` so readers see either the old or the new file, never half of one."""
+	path.parent.mkdir(parents=True, exist_ok=True)
+	fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+	try:
+		with os.fdopen(fd, "wb") as f:
+			f.write(payload)
+			f.flush()
+			os.fsync(f.fileno())
+		os.replace(tmp, path)
+	except BaseException:
+		try:
+			os.unlink(tmp)
+		except OSError:
+			pass
+		raise
+
+
+def append_bytes(path: Path, payload: bytes, new_line: bool = False) -> int:
+	"""Append and fsync `payload`; returns the file size afterwards. On failure nothing is left appended.
+
+	With `new_line`, a file that doesn't end in a newline (a record torn by a crash
+	mid-append) gets one first, so `payload` isn't glued onto the fragment.
+	"""
 	path.parent.mkdir(parents=True, exist_ok=True)
-	with path.open("w", encoding="utf-8") as f:
-		json.dump(data, f, ensure_ascii=False, indent=2)
+	with path.open("a+b", buffering=0) as f:
+		start = f.seek(0, os.SEEK_END)
+		if new_line and start:
+			f.seek(start - 1)
+			if f.read(1) != b"\n":
+				payload = b"\n" + payload
+		try:
+			view = memoryview(payload)
+			while view:
+				view = view[f.write(view):]
+			os.fsync(f.fileno())
+		except BaseException:
+			# Don't leave half a record behind for the next append to run into
+			try:
+				os.ftruncate(f.fileno(), start)
+			except OSError:
+				pass
+			raise
+		return start + len(payload)
@@ -0,0 +1,78 @@
+"""
+Time what entering the High Scores screen costs: a full build vs a label update.
+
+Needs Kivy and a window (textures are uploaded to the GPU). `build` is what every
+enter used to cost; `enter` is what it costs now when nothing changed, and
+`enter after a new best` when one attempt changed the labels (recording it, in a
+throwaway store, is part of that sample). Each sample includes
+the frame that follows, since label textures and layout are redone there; `frame`
+and `frame, redrawn` (nothing changed but the window is repainted) are references. On a machine without a display, run it with
+SDL_VIDEODRIVER=offscreen.
+
+Run from the project root:
+    python -m benchmarks.bench_high_scores_screen [repeats]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
+from kivy.config import Config
+
+Config.set("graphics", "maxfps", "0")  # frames must not wait for vsync pacing
+
+from kivy.base import EventLoop
+from kivy.core.window import Window
+from kivy.uix.screenmanager import ScreenManager
+
+import app.services.high_score_service as hs
+from app.screens.high_scores import HighScoresScreen
+
+
+class _Navigator:
+	def show(self, _name):
+		pass
+
+
+def _time(label, repeats, fn):
+	start = time.perf_counter()
+	for _ in range(repeats):
+		fn()
+		EventLoop.idle()
+	print(f"{label:<26} {(time.perf_counter() - start) / repeats * 1000:8.2f} ms")
+
+
+def main(repeats: int = 50) -> None:
+	tmp = tempfile.TemporaryDirectory()
+	hs._shared_service = hs.HighScoreService(Path(tmp.name) / "highscores.json")
+	EventLoop.ensure_window()
+	manager = ScreenManager()
+	screen = HighScoresScreen(name="high_scores", navigator=_Navigator())
+	manager.add_widget(screen)
+	Window.add_widget(manager)
+	scores = iter(range(1, repeats + 1))
+
+	def build():
+		screen.clear_widgets()
+		screen._build_ui()
+		screen._update_labels()
+
+	def enter_after_new_best():
+		hs._shared_service.record_attempt("addition", next(scores), repeats, [])
+		screen.on_pre_enter()
+
+	EventLoop.idle()
+	_time("frame", repeats, lambda: None)
+	_time("frame, redrawn", repeats, Window.canvas.ask_update)
+	_time("build", repeats, build)
+	_time("enter", repeats, screen.on_pre_enter)
+	_time("enter after a new best", repeats, enter_after_new_best)
+	hs._shared_service.flush()
+	tmp.cleanup()
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,97 @@
+"""
+Time a tap from the home screen: the first show() of each screen vs showing it again.
+
+Every sample runs in a fresh process, so the first show pays the module import and
+the widget build exactly like the first tap after launch. With prewarm the app is
+left on the home screen until the Navigator has finished its idle-frame prewarm
+first (home prewarms quiz, scores and learn; nothing prewarms the lesson). Each
+time runs from show() until the window presents the first frame of the transition.
+
+Needs Kivy and a window (SDL_VIDEODRIVER=offscreen without a display).
+
+Run from the project root:
+    python -m benchmarks.bench_navigation [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCREENS = ("learn", "quiz", "scores", "lesson")
+PREWARM_TIMEOUT = 10.0
+
+
+def _idle_until(done, timeout: float = PREWARM_TIMEOUT) -> None:
+	from kivy.base import EventLoop
+
+	deadline = time.perf_counter() + timeout
+	while not done() and time.perf_counter() < deadline:
+		EventLoop.idle()
+		time.sleep(0.001)
+
+
+def _child(name: str, prewarm: bool) -> None:
+	os.environ.setdefault("KIVY_NO_ARGS", "1")
+	from kivy.config import Config
+
+	Config.set("graphics", "maxfps", "0")  # frames must not wait for vsync pacing
+	from kivy.core.window import Window
+
+	from app.core.navigation import Navigator
+	from app.main import LearnBrightApp
+
+	if not prewarm:
+		Navigator.prewarm = lambda self, names, delay=0.0: None
+	app = LearnBrightApp()
+	root = app.build()
+	Window.add_widget(root)
+	navigator = app.navigator
+	_idle_until(lambda: root.current_screen is not None and root.current_screen.name == "home", 1.0)
+	if prewarm:
+		_idle_until(lambda: not navigator._prewarm and navigator._prewarm_event is None)
+
+	flips = []
+	Window.bind(on_flip=lambda *_args: flips.append(time.perf_counter()))
+
+	def tap() -> float:
+		flips.clear()
+		start = time.perf_counter()
+		if name == "lesson":
+			navigator.show_with_context("lesson", topic="addition")
+		else:
+			navigator.show(name)
+		_idle_until(lambda: flips, 5.0)
+		elapsed = flips[0] - start
+		_idle_until(lambda: not root.transition.is_active)
+		navigator.show("home")
+		_idle_until(lambda: not root.transition.is_active)
+		return elapsed * 1000
+
+	print(f"{tap():.2f} {tap():.2f}")
+
+
+def main(runs: int = 3) -> None:
+	print(f"{'screen':<8} {'prewarm':<8} {'first show':>12} {'repeat':>10}")
+	for name in SCREENS:
+		for prewarm in (False, True):
+			firsts, repeats = [], []
+			for _ in range(runs):
+				result = subprocess.run(
+					[sys.executable, "-m", "benchmarks.bench_navigation", "--child", name, str(int(prewarm))],
+					capture_output=True, text=True, timeout=120,
+				)
+				try:
+					first, repeat = map(float, result.stdout.split()[-2:])
+				except ValueError:
+					raise SystemExit(f"FAILED: no timing from {name}\n{result.stderr[-2000:]}")
+				firsts.append(first)
+				repeats.append(repeat)
+			print(f"{name:<8} {'yes' if prewarm else 'no':<8} {statistics.median(firsts):9.1f} ms {statistics.median(repeats):7.1f} ms")
+
+
+if __name__ == "__main__":
+	if sys.argv[1:2] == ["--child"]:
+		_child(sys.argv[2], sys.argv[3] == "1")
+	else:
+		main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,30 @@
+"""
+Measure question generation cost per mode.
+
+Run from the project root:
+    python -m benchmarks.bench_questions
+"""
+import random
+import time
+
+from app.services.question_bank import BASE_MODES, QuestionBuffer, generate_deck, np
+
+
+def _per_question_ns(fn, count: int) -> float:
+	start = time.perf_counter_ns()
+	fn()
+	return (time.perf_counter_ns() - start) / count
+
+
+def main(count: int = 200_000) -> None:
+	print(f"NumPy sampler: {'yes' if np is not None else 'no (stdlib fallback)'}")
+	rng = random.Random(1)
+	for mode in BASE_MODES + ["mix"]:
+		deck_ns = _per_question_ns(lambda: generate_deck(mode, count, rng), count)
+		buffer = QuestionBuffer(mode, seed=1)
+		buffer_ns = _per_question_ns(lambda: [buffer.next() for _ in range(count)], count)
+		print(f"{mode:<15} deck {deck_ns:8.0f} ns/question   buffer {buffer_ns:8.0f} ns/question")
+
+
+if __name__ == "__main__":
+	main()
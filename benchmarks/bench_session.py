@@ -0,0 +1,32 @@
+"""
+Simulate answered quiz questions through QuizSession without a window.
+
+Run from the project root:
+    python -m benchmarks.bench_session [questions]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.mastery import MasteryScheduler
+from app.services.quiz_session import QuizSession
+
+
+def main(count: int = 1_000_000, accuracy: float = 0.8) -> None:
+	rng = random.Random(7)
+	with tempfile.TemporaryDirectory() as tmp:
+		mastery = MasteryScheduler(Path(tmp) / "mastery.json")
+		for mode in ("addition", "division", "mix"):
+			session = QuizSession(mode, mastery=mastery, seed=1)
+			start = time.perf_counter()
+			for _ in range(count):
+				q = session.next()
+				session.check(q.answer if rng.random() < accuracy else q.answer + 1)
+			elapsed = time.perf_counter() - start
+			print(f"{mode:<10} {count / elapsed * 60 / 1e6:6.2f} M questions/minute  ({session.correct}/{session.question_index} correct)")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
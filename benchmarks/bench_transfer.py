@@ -0,0 +1,90 @@
+"""
+Throughput of the export/import pipelines on synthetic device exports.
+
+Writes `rows` attempts as CSV and JSON Lines, reads them back, merges two
+overlapping device exports and imports them into fresh JSON and SQLite stores.
+Peak RSS is printed after each stage; it should stay flat as `rows` grows.
+
+Run from the project root:
+    python -m benchmarks.bench_transfer [rows]
+"""
+import random
+import sys
+import tempfile
+import time
+import uuid
+from itertools import chain
+from pathlib import Path
+
+from app.services.high_score_service import DEFAULT_MODES, HighScoreService
+from app.services.log_codec import QuestionLog
+from app.services.question_bank import QuestionBuffer
+from app.services.sqlite_score_service import SQLiteHighScoreService
+from app.services.transfer import dedupe, read_file, write_file
+from app.services.write_behind import WriteBehindQueue
+
+
+def _peak_rss_mb() -> float:
+	try:
+		import resource
+	except ImportError:
+		return float("nan")
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _attempts(count: int, seed: int):
+	rng = random.Random(seed)
+	buffer = QuestionBuffer("mix", seed=seed)
+	for i in range(count):
+		log = QuestionLog()
+		for _ in range(10):
+			q = buffer.next()
+			log.append(q, q.answer if rng.random() < 0.8 else q.answer + 1, rng.randrange(500, 8000))
+		yield {
+			"id": uuid.UUID(int=rng.getrandbits(128)).hex,
+			"profile": f"learner{i % 30}",
+			"mode": DEFAULT_MODES[i % len(DEFAULT_MODES)],
+			"score": rng.randrange(11),
+			"total": 10,
+			"timestamp": f"2025-09-01T08:{i % 60:02d}:00",
+			"questions": log.encode(),
+		}
+
+
+def _timed(label: str, rows: int, fn):
+	start = time.perf_counter()
+	result = fn()
+	elapsed = time.perf_counter() - start
+	print(f"{label:<28} {rows / elapsed:>10,.0f} rows/s  peak RSS {_peak_rss_mb():6.1f} MB")
+	return result
+
+
+def main(rows: int = 200_000) -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		tmp = Path(tmp)
+		csv_path, jsonl_path = tmp / "device1.csv", tmp / "device2.jsonl"
+		_timed("write csv", rows, lambda: write_file(_attempts(rows, 1), csv_path))
+		_timed("write jsonl", rows, lambda: write_file(_attempts(rows, 1), jsonl_path))
+		_timed("read csv", rows, lambda: sum(1 for _ in read_file(csv_path)))
+		_timed("read jsonl", rows, lambda: sum(1 for _ in read_file(jsonl_path)))
+
+		# device2 holds the same attempts as device1, so a merge keeps `rows` of 2 * rows
+		merged_path = tmp / "class.jsonl"
+		merged = _timed("merge csv + jsonl", 2 * rows, lambda: write_file(dedupe(chain(read_file(csv_path), read_file(jsonl_path))), merged_path))
+
+		writer = WriteBehindQueue(dispatch=lambda callback: callback())
+		json_store = HighScoreService(tmp / "json" / "highscores.json", writer=writer)
+		added_json = _timed("import into json store", 2 * rows, lambda: json_store.import_attempts(chain(read_file(csv_path), read_file(jsonl_path))))
+		sqlite_store = SQLiteHighScoreService(tmp / "scores.db", json_path=tmp / "none" / "highscores.json", writer=writer)
+		added_sqlite = _timed("import into sqlite store", 2 * rows, lambda: sqlite_store.import_attempts(chain(read_file(csv_path), read_file(jsonl_path))))
+		sqlite_store.close()
+
+		print(f"merged {merged}, json store added {added_json}, sqlite store added {added_sqlite} (expected {rows} each)")
+		if not merged == added_json == added_sqlite == rows:
+			raise SystemExit("FAILED: duplicates were kept or rows were lost")
+		print("OK")
+
+
+if __name__ == "__main__":
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,94 @@
+"""
+Load-test the live drill server with many simulated devices from one process.
+
+Starts `python -m app.server.live` in a subprocess (a single event loop, so one
+core), connects the clients, answers every question after a random delay and
+checks every answer was counted. Prints how long each question took to reach
+all clients and the server's peak RSS.
+
+Run from the project root:
+    python -m benchmarks.live_load [clients] [questions]
+"""
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+
+
+def _free_port() -> int:
+	with socket.socket() as s:
+		s.bind(("127.0.0.1", 0))
+		return s.getsockname()[1]
+
+
+def _solve(problem: str) -> int:
+	a, op, b = problem.split()[:3]  # "7 × 8 = ?"
+	a, b = int(a), int(b)
+	return {"+": a + b, "-": a - b, "×": a * b, "÷": a // b if b else 0}[op]
+
+
+async def _device(port: int, name: str, rng: random.Random, received: dict, answered: list) -> dict:
+	reader, writer = await asyncio.open_connection("127.0.0.1", port)
+	writer.write(json.dumps({"join": name}).encode() + b"\n")
+	end = {}
+	while True:
+		line = await reader.readline()
+		if not line:
+			break
+		message = json.loads(line)
+		if message["type"] == "question":
+			received.setdefault(message["index"], []).append(time.perf_counter())
+			await asyncio.sleep(rng.uniform(0, message["time_limit"] * 0.5))
+			answer = _solve(message["problem"])
+			if rng.random() < 0.2:
+				answer += 1
+			writer.write(json.dumps({"index": message["index"], "answer": answer}).encode() + b"\n")
+			answered[0] += 1
+		elif message["type"] in ("end", "rejected"):
+			end = message
+			break
+	writer.close()
+	return end
+
+
+async def _run(port: int, clients: int) -> tuple:
+	rng = random.Random(7)
+	received: dict = {}
+	answered = [0]
+	tasks = [asyncio.create_task(_device(port, f"student{i:04d}", random.Random(rng.random()), received, answered)) for i in range(clients)]
+	ends = await asyncio.gather(*tasks)
+	return ends, received, answered[0]
+
+
+def _percentile(values, fraction):
+	values = sorted(values)
+	return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main(clients: int = 500, questions: int = 10) -> None:
+	port = _free_port()
+	server = subprocess.Popen(
+		[sys.executable, "-m", "app.server.live", "--host", "127.0.0.1", "--port", str(port), "--questions", str(questions), "--time-limit", "1", "--expect", str(clients), "--wait", "30", "--seed", "1"],
+		stdout=subprocess.PIPE,
+		text=True,
+	)
+	print(server.stdout.readline().strip())  # printed once the server accepts connections
+	ends, received, answered = asyncio.run(_run(port, clients))
+	output, _ = server.communicate(timeout=60)
+	print(output.strip().splitlines()[-1])
+
+	counted = ends[0].get("answers", 0) if ends else 0
+	spreads = [(max(times) - min(times)) * 1000 for times in received.values()]
+	print(f"{clients} clients, {questions} questions: {answered} answers sent, {counted} counted")
+	print(f"question fan-out to all clients: p50 {_percentile(spreads, 0.5):.1f} ms, max {max(spreads):.1f} ms")
+	if any(len(times) != clients for times in received.values()) or counted != answered or answered != clients * questions:
+		raise SystemExit("FAILED: some clients missed questions or answers were not counted")
+	print("OK")
+
+
+if __name__ == "__main__":
+	args = [int(a) for a in sys.argv[1:3]]
+	main(*args)
@@ -0,0 +1,45 @@
+"""
+Cold-start time to first frame, checked against the startup budget.
+
+Launches the app several times with LEARNBRIGHT_PROFILE_STARTUP=exit (it quits
+right after its first frame), prints the per-phase breakdown of the last run and
+fails if the median time to first frame is over budget. Needs Kivy and a display.
+
+Run from the project root:
+    python -m benchmarks.startup [runs] [budget_ms]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+from app.core.startup import BUDGET_ENV, PROFILE_ENV, budget_ms
+
+_FIRST_FRAME = re.compile(r"time to first frame: ([\d.]+) ms")
+
+
+def main(runs: int = 5, budget: float = 0.0) -> None:
+	budget = budget or budget_ms()
+	env = {**os.environ, PROFILE_ENV: "exit", BUDGET_ENV: str(budget)}
+	times = []
+	report = ""
+	for _ in range(runs):
+		result = subprocess.run([sys.executable, "-m", "app.main"], env=env, capture_output=True, text=True, timeout=120)
+		# Kivy's stderr wrapper may indent what the app prints
+		report = "\n".join(line.strip() for line in result.stderr.splitlines() if line.lstrip().startswith("[startup]"))
+		match = _FIRST_FRAME.search(report)
+		if match is None:
+			raise SystemExit(f"FAILED: no startup report\n{result.stderr[-2000:]}")
+		times.append(float(match.group(1)))
+	print(report)
+	median = statistics.median(times)
+	print(f"{runs} runs: median {median:.1f} ms, min {min(times):.1f} ms, max {max(times):.1f} ms (budget {budget:.0f} ms)")
+	if median > budget:
+		raise SystemExit("FAILED: time to first frame is over budget")
+	print("OK")
+
+
+if __name__ == "__main__":
+	args = sys.argv[1:3]
+	main(int(args[0]) if args else 5, float(args[1]) if len(args) > 1 else 0.0)
@@ -0,0 +1,85 @@
+"""
+Hammer one data directory from several processes and check no attempt is lost.
+
+Each worker process records attempts for its own learners through its own
+HighScoreService, with a tiny compaction threshold so snapshots are rewritten
+while the others keep appending. Afterwards a fresh service must see every
+attempt in the journal and every learner's true best. Finally a record torn by a
+crash mid-append is left at the end of the journal; the next attempt must still
+survive a reload.
+
+Run from the project root:
+    python -m benchmarks.stress_store [processes] [attempts_per_process]
+"""
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import app.services.high_score_service as hs
+from app.services.write_behind import WriteBehindQueue
+
+
+def _worker(args):
+	path, worker, attempts = args
+	hs.COMPACT_THRESHOLD = 4 * 1024
+	rng = random.Random(worker)
+	writer = WriteBehindQueue(dispatch=lambda callback: callback())
+	service = hs.HighScoreService(Path(path), writer=writer)
+	bests = {}
+	for i in range(attempts):
+		profile = f"p{worker}-{i % 7}"
+		mode = hs.DEFAULT_MODES[i % len(hs.DEFAULT_MODES)]
+		score = rng.randrange(1000)
+		service.record_attempt(mode, score, 1000, [], profile=profile)
+		bests[(profile, mode)] = max(score, bests.get((profile, mode), -1))
+		if i % 50 == 0:
+			service.get_overview()  # interleave refreshes with other processes' writes
+	writer.flush()
+	return bests
+
+
+def _check_torn_line(path: Path) -> bool:
+	writer = WriteBehindQueue(dispatch=lambda callback: callback())
+	service = hs.HighScoreService(path, writer=writer)
+	with service.journal_path.open("ab") as f:
+		f.write(b'{"id":"torn","profile":"torn","mode":"addition","sco')
+	service = hs.HighScoreService(path, writer=writer)
+	service.record_attempt("addition", 1001, 1001, [], profile="after-crash")
+	writer.flush()
+	reloaded = hs.HighScoreService(path, writer=writer)
+	survived = (reloaded.get_best("addition", profile="after-crash") or {}).get("score") == 1001
+	print(f"attempt recorded after a torn journal line: {'kept' if survived else 'LOST'}")
+	return survived
+
+
+def main(processes: int = 8, attempts: int = 500) -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		path = Path(tmp) / "highscores.json"
+		start = time.perf_counter()
+		with multiprocessing.Pool(processes) as pool:
+			results = pool.map(_worker, [(str(path), w, attempts) for w in range(processes)])
+		elapsed = time.perf_counter() - start
+
+		writer = WriteBehindQueue(dispatch=lambda callback: callback())
+		service = hs.HighScoreService(path, writer=writer)
+		ids = [record["id"] for record in service.iter_attempts()]
+		expected = {key: best for result in results for key, best in result.items()}
+		wrong = [key for key, best in expected.items() if (service.get_best(key[1], profile=key[0]) or {}).get("score") != best]
+
+		total = processes * attempts
+		print(f"{processes} processes x {attempts} attempts in {elapsed:.2f}s ({total / elapsed:,.0f} attempts/s)")
+		print(f"journal records: {len(ids)} / {total}, unique ids: {len(set(ids))}")
+		print(f"learner bests correct: {len(expected) - len(wrong)} / {len(expected)}")
+		if len(ids) != total or len(set(ids)) != total or wrong:
+			raise SystemExit("FAILED: attempts were lost or bests are wrong")
+		if not _check_torn_line(path):
+			raise SystemExit("FAILED: a torn journal line swallowed the next attempt")
+		print("OK")
+
+
+if __name__ == "__main__":
+	args = [int(a) for a in sys.argv[1:3]]
+	main(*args)
@@ -0,0 +1,87 @@
+"""
+Record attempts offline, then sync them to a local stand-in aggregation server.
+
+While no server is listening every sync fails and the cursor stays put; once the
+server is up the backlog goes out in gzip batches and a second sync sends nothing.
+Replaying from a reset cursor, or under a new device id (a lost sync_state.json),
+must not create duplicates on the server. An attempt the server can't store (here a
+journal line without an id, as written before attempts had ids) is skipped without
+holding up the attempts after it.
+
+Run from the project root:
+    python -m benchmarks.sync_roundtrip [attempts] [batch_size]
+"""
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import app.services.high_score_service as hs
+from app.server.aggregator import AggregationServer
+from app.services.sync import SyncClient
+from app.services.write_behind import WriteBehindQueue
+
+
+def _free_port() -> int:
+	with socket.socket() as s:
+		s.bind(("127.0.0.1", 0))
+		return s.getsockname()[1]
+
+
+def main(attempts: int = 2000, batch_size: int = 500) -> None:
+	with tempfile.TemporaryDirectory() as tmp:
+		writer = WriteBehindQueue(dispatch=lambda callback: callback())
+		service = hs.HighScoreService(Path(tmp) / "highscores.json", writer=writer)
+		for i in range(attempts):
+			mode = hs.DEFAULT_MODES[i % len(hs.DEFAULT_MODES)]
+			service.record_attempt(mode, i % 10, 10, [], profile=f"learner{i % 25}")
+		writer.flush()
+
+		port = _free_port()
+		client = SyncClient(f"http://127.0.0.1:{port}", service=service, state_path=Path(tmp) / "sync_state.json", batch_size=batch_size, timeout=2)
+		try:
+			client.sync_once()
+			raise SystemExit("FAILED: sync succeeded with no server running")
+		except OSError:
+			print(f"offline: sync failed as expected, cursor still at {client._state['cursor']}")
+
+		server = AggregationServer("127.0.0.1", port, quiet=True)
+		threading.Thread(target=server.serve_forever, daemon=True).start()
+		try:
+			start = time.perf_counter()
+			sent = client.sync_once()
+			elapsed = time.perf_counter() - start
+			batches = -(-sent // batch_size)
+			print(f"online: sent {sent} attempts in {batches} requests, {elapsed * 1000:.1f} ms")
+			again = client.sync_once()
+			client._state["cursor"] = 0
+			client.sync_once()
+			client._state.update(cursor=0, device_id="replacement-device")
+			client.sync_once()
+			stored = server.store.count()
+			print(f"second sync sent {again}; server holds {stored} attempts after full replays under both device ids")
+			if sent != attempts or again != 0 or stored != attempts:
+				raise SystemExit("FAILED: attempts were lost or duplicated")
+
+			# Journals written before attempts had ids hold lines the server can't key
+			with open(service.journal_path, "ab") as f:
+				f.write(b'{"mode":"addition","score":3,"total":10,"timestamp":"2024-01-01T00:00:00","questions":[]}\n')
+			service.refresh()
+			service.record_attempt("addition", 7, 10, [], profile="after-malformed")
+			writer.flush()
+			late = client.sync_once()
+			_, end = service.read_attempts_after(client._state["cursor"], 1)
+			print(f"after a malformed attempt: sent {late}, server holds {server.store.count()}")
+			if late != 1 or server.store.count() != attempts + 1 or end != client._state["cursor"]:
+				raise SystemExit("FAILED: a malformed attempt held up the sync")
+			print("OK")
+		finally:
+			server.shutdown()
+			server.server_close()
+
+
+if __name__ == "__main__":
+	args = [int(a) for a in sys.argv[1:3]]
+	main(*args)
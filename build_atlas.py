@@ -0,0 +1,63 @@
+"""
+Pack the small icons under assets/images into a Kivy atlas (assets/atlas/icons.atlas).
+
+Buttons look icons up by atlas key (app.utils.assets.resolve_icon), so a menu screen
+binds one texture instead of one per icon. Without a built atlas they fall back to
+the loose PNGs. convert_icon.py runs this along with the other asset steps; on its
+own:
+
+    python build_atlas.py
+"""
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parent
+IMAGES_DIR = ROOT / "assets" / "images"
+ATLAS_DIR = ROOT / "assets" / "atlas"
+ATLAS_NAME = "icons"
+# Anything with a side above this is a picture, not an icon, and stays a loose file
+MAX_ICON_SIDE = 64
+ATLAS_SIZE = 256
+
+
+def find_icons(images_dir=IMAGES_DIR, max_side=MAX_ICON_SIDE):
+    from PIL import Image
+
+    icons = []
+    for path in sorted(images_dir.glob("*.png")):
+        with Image.open(path) as img:
+            if max(img.size) <= max_side:
+                icons.append(path)
+    return icons
+
+
+def build_icon_atlas(icons, atlas_dir=ATLAS_DIR, name=ATLAS_NAME, size=ATLAS_SIZE):
+    """Write <atlas_dir>/<name>.atlas plus its page PNGs; returns the .atlas path."""
+    from kivy.atlas import Atlas
+
+    atlas_dir.mkdir(parents=True, exist_ok=True)
+    for old_page in atlas_dir.glob(f"{name}-*.png"):
+        old_page.unlink()
+    # use_path=False keys each icon by its file stem ("star.png" -> "star")
+    result = Atlas.create(str(atlas_dir / name), [str(p) for p in icons], size, use_path=False)
+    if not result:
+        raise RuntimeError("Kivy could not build the atlas")
+    return Path(result[0])
+
+
+def main():
+    try:
+        icons = find_icons()
+        if not icons:
+            print(f"No icons found in {IMAGES_DIR}")
+            return 1
+        atlas = build_icon_atlas(icons)
+    except ImportError as e:
+        print(f"Error: {e.name} is not installed (the atlas needs Kivy and Pillow)")
+        return 1
+    print(f"Packed {len(icons)} icons into {atlas.relative_to(ROOT)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,221 @@
 """
-Simple script to convert logo.png to logo.ico for the EXE icon
+Asset build: the EXE icon, the icon atlas, display-sized title images and lesson posters.
+
+    python convert_icon.py              # everything that changed
+    python convert_icon.py --compress   # also quantize scaled images to a 256-colour palette
+    python convert_icon.py ico          # just logo.ico (before: pyinstaller learnbright.spec)
+    python convert_icon.py --force      # rebuild even what is up to date
+
+Title images and posters are drawn at most DISPLAY_SIZES / POSTER_SIZES pixels but the
+sources are much larger; decoding and uploading the full-size PNG on every screen
+build is wasted work. Each one is written once per DPI bucket to
+assets/scaled/<bucket>/ and resolve_image_path picks the bucket that matches the
+screen. Outputs are not committed; without them the app uses the originals.
+
+The build is incremental: every job's source files are hashed and recorded in
+assets/build_manifest.json with its settings and outputs, and a job only runs again
+when one of those changed or an output is missing. Jobs that do run are spread over
+a process pool.
 """
-from PIL import Image
-
-try:
-    # Open the logo
-    img = Image.open('assets/images/logo.png')
-    
-    # Convert to ICO with multiple sizes (for better quality at different resolutions)
-    img.save('assets/images/logo.ico', format='ICO', sizes=[(256, 256), (128, 128), (64, 64), (48, 48), (32, 32), (16, 16)])
-    
-    print("✅ Icon created successfully: assets/images/logo.ico")
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, List, NamedTuple
+
+from build_atlas import ATLAS_DIR, IMAGES_DIR, ROOT, build_icon_atlas, find_icons
+from app.utils.assets import DPI_BUCKETS, SCALED_DIR
+
+# Largest box (in pixels, at the 1x bucket) each title image is drawn into
+DISPLAY_SIZES = {
+    "quiz_games.png": (500, 230),
+    "watch.png": (500, 230),
+    "highscore.png": (500, 230),
+}
+# Lesson posters fill the 200 px tall video frame until playback starts
+POSTER_SIZES = {
+    "addition_thumb.png": (356, 200),
+    "subtraction_thumb.png": (356, 200),
+    "multiplication_thumb.png": (356, 200),
+    "division_thumb.png": (356, 200),
+}
+STEPS = ("ico", "atlas", "scaled", "posters")
+ICO_SIZES = [(256, 256), (128, 128), (64, 64), (48, 48), (32, 32), (16, 16)]
+
+MANIFEST_PATH = ROOT / "assets" / "build_manifest.json"
+# Bump when a job's output changes for the same inputs and settings
+BUILD_VERSION = 1
+
+
+def build_ico(images_dir=IMAGES_DIR):
+    from PIL import Image
+
+    with Image.open(images_dir / "logo.png") as img:
+        # Multiple sizes for better quality at different resolutions
+        img.save(images_dir / "logo.ico", format="ICO", sizes=ICO_SIZES)
+    return images_dir / "logo.ico"
+
+
+def fit(size, box):
+    """Largest size with the aspect ratio of `size` that fits in `box` (never upscales)."""
+    scale = min(box[0] / size[0], box[1] / size[1], 1.0)
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def build_scaled(name, box, compress=False, images_dir=IMAGES_DIR, scaled_dir=ROOT / "assets" / SCALED_DIR):
+    """Write `name` downscaled for each DPI bucket; returns the paths written."""
+    from PIL import Image
+
+    written = []
+    with Image.open(images_dir / name) as src:
+        src.load()
+        for bucket, scale in DPI_BUCKETS:
+            target = fit(src.size, (box[0] * scale, box[1] * scale))
+            img = src.resize(target, Image.LANCZOS) if target != src.size else src.copy()
+            if compress:
+                # Palette PNGs keep alpha and are a fraction of the size for flat artwork
+                img = img.convert("RGBA").quantize(256, method=Image.FASTOCTREE)
+            out = scaled_dir / bucket / name
+            out.parent.mkdir(parents=True, exist_ok=True)
+            img.save(out, optimize=True)
+            written.append(out)
+    return written
+
+
+class Job(NamedTuple):
+    """One independent unit of work; `run(**params)` returns the paths it wrote."""
+    name: str
+    run: Callable[..., List[Path]]
+    inputs: List[Path]
+    params: dict
+
+
+def _run_ico():
+    return [build_ico()]
+
+
+def _run_atlas(icons):
+    atlas = build_icon_atlas([IMAGES_DIR / name for name in icons], ATLAS_DIR)
+    return [atlas, *sorted(atlas.parent.glob(f"{atlas.stem}-*.png"))]
+
+
+def _run_scaled(name, box, compress):
+    return build_scaled(name, tuple(box), compress=compress)
+
+
+def plan(steps, compress=False):
+    jobs = []
+    if "ico" in steps:
+        jobs.append(Job("ico", _run_ico, [IMAGES_DIR / "logo.png"], {}))
+    if "atlas" in steps:
+        icons = find_icons()
+        jobs.append(Job("atlas", _run_atlas, icons, {"icons": [p.name for p in icons]}))
+    sizes = {**(DISPLAY_SIZES if "scaled" in steps else {}), **(POSTER_SIZES if "posters" in steps else {})}
+    for name, box in sizes.items():
+        if not (IMAGES_DIR / name).exists():
+            print(f"⚠️  Skipping {name}: not found in assets/images/")
+            continue
+        jobs.append(Job(f"scaled/{name}", _run_scaled, [IMAGES_DIR / name], {"name": name, "box": list(box), "compress": compress}))
+    return jobs
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _rel(path):
+    return Path(path).resolve().relative_to(ROOT).as_posix()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != BUILD_VERSION:
+        return {}
+    return manifest.get("jobs", {})
+
+
+def save_manifest(jobs, path=MANIFEST_PATH):
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": BUILD_VERSION, "jobs": jobs}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def fingerprint(job):
+    return {"inputs": {_rel(p): file_hash(p) for p in job.inputs}, "params": job.params}
+
+
+def is_current(entry, fp):
+    if not entry or entry.get("inputs") != fp["inputs"] or entry.get("params") != fp["params"]:
+        return False
+    return all((ROOT / out).exists() for out in entry.get("outputs", []))
+
+
+def build(jobs, workers=None, force=False):
+    """Run the jobs whose inputs, settings or outputs changed; returns (built, skipped)."""
+    manifest = load_manifest()
+    pending = {}
+    for job in jobs:
+        fp = fingerprint(job)
+        if force or not is_current(manifest.get(job.name), fp):
+            pending[job.name] = (job, fp)
+    if not pending:
+        return [], len(jobs)
+
+    built = []
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(pending))) as pool:
+            futures = {pool.submit(job.run, **job.params): name for name, (job, _fp) in pending.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                outputs = future.result()
+                manifest[name] = {**pending[name][1], "outputs": [_rel(p) for p in outputs]}
+                built.append((name, outputs))
+    finally:
+        # Keep what finished even if a job failed, so the next run picks up from there
+        save_manifest(manifest)
+    return built, len(jobs) - len(pending)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("steps", nargs="*", metavar="{ico,atlas,scaled,posters}", help="what to build (default: everything)")
+    parser.add_argument("--compress", action="store_true", help="quantize scaled images to a 256-colour palette")
+    parser.add_argument("--force", action="store_true", help="rebuild even if nothing changed")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args(argv)
+    steps = args.steps or list(STEPS)
+    unknown = set(steps) - set(STEPS)
+    if unknown:
+        parser.error(f"unknown step(s): {', '.join(sorted(unknown))}")
+
+    try:
+        built, skipped = build(plan(steps, compress=args.compress), workers=args.jobs, force=args.force)
+    except ImportError as e:
+        print(f"❌ Error: {e.name} not installed")
+        print("Install it with: pip install pillow kivy")
+        return 1
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e.filename} not found")
+        return 1
+    for name, outputs in sorted(built):
+        sizes = ", ".join(f"{_rel(p)} {p.stat().st_size // 1024} KB" for p in outputs)
+        print(f"✅ {name}: {sizes}")
+    print(f"Built {len(built)}, up to date {skipped}")
     print("You can now build the EXE with: pyinstaller learnbright.spec")
-    
-except FileNotFoundError:
-    print("❌ Error: logo.png not found in assets/images/")
-    print("Make sure you have a logo.png file in the assets/images folder")
-    
-except ImportError:
-    print("❌ Error: Pillow not installed")
-    print("Install it with: pip install pillow")
-    
-except Exception as e:
-    print(f"❌ Error: {e}")
+    return 0
+
 
+if __name__ == "__main__":
+    sys.exit(main())